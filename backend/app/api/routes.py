@@ -46,12 +46,12 @@ async def upload_song(
     3. Stores in database
     4. Returns song ID and stats
     
-    **File types supported**: MP3, WAV, FLAC, OGG, M4A
+    **File types supported**: MP3, WAV, FLAC, OGG, M4A, OPUS
     """
     
     try:
         # Validate file type
-        allowed_extensions = ['.mp3', '.wav', '.flac', '.ogg', '.m4a']
+        allowed_extensions = ['.mp3', '.wav', '.flac', '.ogg', '.m4a', '.opus']
         file_ext = os.path.splitext(file.filename)[1].lower()
         
         if file_ext not in allowed_extensions:
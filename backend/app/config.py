@@ -0,0 +1,42 @@
+"""
+Fingerprinting and matching parameters.
+
+Kept free of heavy imports (numpy/librosa/SQLAlchemy) so scripts can read the
+configuration without loading the audio or database stack.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class FingerprintConfig:
+    """Defaults used by AudioFingerprinter. Changing these invalidates stored fingerprints."""
+    sample_rate: int = 22050  # Hz, 22050 is good for music
+    n_fft: int = 2048  # FFT window size, ~93ms per frame
+    hop_length: int = 512  # Samples between frames, ~23ms
+    freq_min: int = 20  # Hz, bottom of human hearing
+    freq_max: int = 8000  # Hz, music information is mostly below 8kHz
+    peak_neighborhood_size: int = 10  # Peak search area (smaller = more peaks)
+    fan_value: int = 5  # Each peak pairs with the next 5 peaks
+    target_zone_width: int = 75  # Look ahead 75 time frames
+    target_zone_start: int = 1  # Start pairing 1 frame ahead
+
+
+@dataclass(frozen=True)
+class MatchingConfig:
+    """Query sampling and acceptance thresholds used by DatabaseManager.find_matches."""
+    max_query_fingerprints: int = 400  # ~9 seconds of audio
+    batch_size: int = 100  # Hashes per lookup batch
+    expected_good_match: int = 100  # Matching hashes of a typical true match
+    min_match_percentage: float = 0.05  # Fraction of expected_good_match required
+
+    @property
+    def min_matching_fingerprints(self) -> int:
+        return int(self.expected_good_match * self.min_match_percentage)
+
+    @property
+    def min_confidence_percentage(self) -> float:
+        return self.min_match_percentage * 100
+
+
+FINGERPRINT_CONFIG = FingerprintConfig()
+MATCHING_CONFIG = MatchingConfig()
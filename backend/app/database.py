@@ -1,9 +1,12 @@
 import datetime
+import functools
 from sqlalchemy import create_engine # Creates connection to PostgreSQL database
 from sqlalchemy.orm import sessionmaker, Session, joinedload # sessionmaker creates sessions to interact with DB
 from .models import Base, Song, Fingerprint
+from .config import MATCHING_CONFIG
 from typing import List, Tuple, Dict
 import hashlib # For generating SHA-256 file hashes
+import io # In-memory buffer for COPY FROM STDIN
 import os
 import time  # For timing operations
 from dotenv import load_dotenv # To load environment variables like DATABASE_URL
@@ -124,20 +127,8 @@ class DatabaseManager:
             - After adding fingerprints we will commit everything together
             """
             
-            # Create fingerprint entries using bulk insert for maximum efficiency
-            # Use bulk_insert_mappings for raw SQL INSERT - much faster than ORM
-            fingerprint_dicts = [
-                {
-                    'hash_value': fp_hash,
-                    'time_offset': int(time_offset),
-                    'song_id': song.id
-                }
-                for fp_hash, time_offset in fingerprints
-            ]
-            
-            # Bulk insert: Direct SQL INSERT, bypasses ORM overhead
-            # For 30k+ fingerprints, this is 10-50x faster than add_all()
-            session.bulk_insert_mappings(Fingerprint, fingerprint_dicts)
+            # Bulk insert fingerprints in the same transaction as the song row
+            self.bulk_insert_fingerprints(song.id, fingerprints, session=session)
             
             session.commit() # Saves everthing to the database, If anything fails before this, nothing is saved (Rollback)
             
@@ -153,7 +144,56 @@ class DatabaseManager:
         finally:
             session.close()
     
-    def find_matches(self, query_fingerprints: List[Tuple[str, int]]) -> Dict:
+    def bulk_insert_fingerprints(self, song_id: int,
+                                 fingerprints: List[Tuple[str, int]],
+                                 session: Session = None) -> int:
+        """
+        Insert fingerprints for a song with PostgreSQL COPY FROM STDIN.
+        
+        COPY streams every row in a single statement and skips per-row INSERT
+        parsing/planning, so a song's 30k+ fingerprints load in one round-trip.
+        
+        Args:
+            song_id: ID of the song the fingerprints belong to
+            fingerprints: List of (hash, time_offset) tuples
+            session: Session whose transaction to join (caller commits); if None a new one is committed here
+            
+        Returns:
+            Number of fingerprints inserted
+        """
+        own_session = session is None
+        if own_session:
+            session = self.get_session()
+        
+        try:
+            # Tab-separated COPY text format; hashes are hex digests so nothing needs escaping
+            buffer = io.StringIO(''.join(
+                f"{fp_hash}\t{int(time_offset)}\t{song_id}\n" for fp_hash, time_offset in fingerprints
+            ))
+            
+            # Raw DBAPI cursor on the session's connection -> same transaction as the ORM work
+            cursor = session.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    "COPY fingerprints (hash_value, time_offset, song_id) FROM STDIN",
+                    buffer
+                )
+            finally:
+                cursor.close()
+            
+            if own_session:
+                session.commit()
+            return len(fingerprints)
+        except Exception:
+            if own_session:
+                session.rollback()
+            raise
+        finally:
+            if own_session:
+                session.close()
+    
+    def find_matches(self, query_fingerprints: List[Tuple[str, int]],
+                     session: Session = None) -> Dict:
         """
         Find matching songs for a set of query fingerprints.
         
@@ -166,20 +206,22 @@ class DatabaseManager:
         
         Args:
             query_fingerprints: List of (hash, time_offset) tuples from recorded audio
+            session: Open session to run the lookups on (caller closes it); if None one is opened and closed here
             
         Returns:
             Dictionary with match results or None
         """
-        session = self.get_session()
+        own_session = session is None
+        if own_session:
+            session = self.get_session()
         
         try:
             # Dynamic thresholds based on recording length
             # With 1000 sampled fingerprints, adjust expectations
             # False positives: 1-15, True matches: 50-100+
-            EXPECTED_GOOD_MATCH = 100  # Baseline for true match with 1000 samples
-            MIN_MATCH_PERCENTAGE = 0.05  # Lower threshold to 5%
-            MIN_MATCHING_FINGERPRINTS = int(EXPECTED_GOOD_MATCH * MIN_MATCH_PERCENTAGE)  # 5 matches minimum
-            MIN_CONFIDENCE_PERCENTAGE = MIN_MATCH_PERCENTAGE * 100  # 5%
+            # (values live in app.config.MatchingConfig)
+            MIN_MATCHING_FINGERPRINTS = MATCHING_CONFIG.min_matching_fingerprints  # 5 matches minimum
+            MIN_CONFIDENCE_PERCENTAGE = MATCHING_CONFIG.min_confidence_percentage  # 5%
             print(f"Debug: Thresholds - Min fingerprints: {MIN_MATCHING_FINGERPRINTS}, Min confidence: {MIN_CONFIDENCE_PERCENTAGE}%")
             
             # Dictionary to store matches: {song_id: {time_delta: count}}
@@ -206,8 +248,8 @@ class DatabaseManager:
             
             # Optimize lookups: batch query to avoid huge IN clause
             # Use strategic sampling: take fingerprints from different parts of recording
-            MAX_QUERY_FINGERPRINTS = 400  # ~9 seconds of audio - optimized for speed
-            BATCH_SIZE = 100  # Process in batches for early exit
+            MAX_QUERY_FINGERPRINTS = MATCHING_CONFIG.max_query_fingerprints  # ~9 seconds of audio - optimized for speed
+            BATCH_SIZE = MATCHING_CONFIG.batch_size  # Process in batches for early exit
             
             # Strategic sampling: every Nth fingerprint for better coverage
             if len(query_fingerprints) > MAX_QUERY_FINGERPRINTS:
@@ -295,7 +337,7 @@ class DatabaseManager:
             
             # Calculate confidence percentage
             # Show as percentage of a good match baseline (100 fingerprints)
-            confidence_pct = min(100, (best_score / 100) * 100)
+            confidence_pct = min(100, (best_score / MATCHING_CONFIG.expected_good_match) * 100)
             print(f"Debug: Best match - Song ID: {best_match}")
             print(f"Debug: Confidence: {best_score} matching hashes")
             print(f"Debug: Confidence Percentage: {confidence_pct:.2f}%")
@@ -334,7 +376,8 @@ class DatabaseManager:
             return None
             
         finally:
-            session.close()
+            if own_session:
+                session.close()
     
     # Other CRUD operations as needed
     
@@ -420,4 +463,15 @@ class DatabaseManager:
             for byte_block in iter(lambda: f.read(4096), b""):
                 sha256_hash.update(byte_block)
         
-        return sha256_hash.hexdigest()
\ No newline at end of file
+        return sha256_hash.hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def get_db() -> DatabaseManager:
+    """
+    Shared DatabaseManager for the current process (created lazily on first call).
+    
+    Scripts that run several checks in one process reuse one engine and
+    connection pool instead of paying engine setup and a new connection each time.
+    """
+    return DatabaseManager()
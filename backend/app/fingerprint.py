@@ -4,6 +4,7 @@ from scipy.ndimage import maximum_filter
 from scipy.ndimage import generate_binary_structure, binary_erosion
 import hashlib
 from typing import List, Tuple
+from .config import FINGERPRINT_CONFIG
 try:
     from numba import jit
     NUMBA_AVAILABLE = True
@@ -15,6 +16,48 @@ except ImportError:
         return decorator
 
 
+@jit(nopython=True, cache=True)
+def _pair_peaks(times: np.ndarray, freqs: np.ndarray,
+                zone_start: int, zone_width: int, fan_value: int):
+    """
+    Enumerate (anchor, target) peak pairs for hashing, compiled with numba.
+    
+    Walks the target zone exactly like the loop in generate_hashes, but in
+    machine code: a counting pass sizes the output, a second pass fills it.
+    cache=True writes the compiled function to __pycache__ so parallel
+    workers reuse it instead of each paying the compile cost.
+    
+    Returns:
+        Parallel arrays (anchor_time, anchor_freq, target_freq, time_delta)
+    """
+    n = times.shape[0]
+    
+    count = 0
+    for i in range(n):
+        for j in range(i + zone_start, min(i + zone_width, n)):
+            count += 1
+            if j - i >= fan_value:
+                break
+    
+    anchor_time = np.empty(count, dtype=np.int64)
+    anchor_freq = np.empty(count, dtype=np.int64)
+    target_freq = np.empty(count, dtype=np.int64)
+    time_delta = np.empty(count, dtype=np.int64)
+    
+    k = 0
+    for i in range(n):
+        for j in range(i + zone_start, min(i + zone_width, n)):
+            anchor_time[k] = times[i]
+            anchor_freq[k] = freqs[i]
+            target_freq[k] = freqs[j]
+            time_delta[k] = times[j] - times[i]
+            k += 1
+            if j - i >= fan_value:
+                break
+    
+    return anchor_time, anchor_freq, target_freq, time_delta
+
+
 class AudioFingerprinter:
     """
     Audio fingerprinting engine that converts audio into unique hashes.
@@ -28,11 +71,11 @@ class AudioFingerprinter:
     """
     
     def __init__(self, 
-                 sample_rate: int = 22050,
-                 n_fft: int = 2048,
-                 hop_length: int = 512,
-                 freq_min: int = 20,
-                 freq_max: int = 8000):
+                 sample_rate: int = FINGERPRINT_CONFIG.sample_rate,
+                 n_fft: int = FINGERPRINT_CONFIG.n_fft,
+                 hop_length: int = FINGERPRINT_CONFIG.hop_length,
+                 freq_min: int = FINGERPRINT_CONFIG.freq_min,
+                 freq_max: int = FINGERPRINT_CONFIG.freq_max):
         """
         Initialize the fingerprinter with audio processing parameters.
         
@@ -50,13 +93,13 @@ class AudioFingerprinter:
         self.freq_max = freq_max
         
         # Peak finding parameters
-        self.peak_neighborhood_size = 10  # When looking for peaks check 10x10 pixel area (smaller = more peaks)
+        self.peak_neighborhood_size = FINGERPRINT_CONFIG.peak_neighborhood_size  # When looking for peaks check 10x10 pixel area (smaller = more peaks)
         self.min_amplitude = None  # We'll calculate adaptively
         
         # Fingerprint parameters
-        self.fan_value = 5 # Each peak pairs with next 5 peaks (reduced from 30 - was generating too many)
-        self.target_zone_width = 75 # Look ahead 75 time frames (reduced from 250)
-        self.target_zone_start = 1 # Start pairing from 1 frame ahead (capture nearby peaks)
+        self.fan_value = FINGERPRINT_CONFIG.fan_value # Each peak pairs with next 5 peaks (reduced from 30 - was generating too many)
+        self.target_zone_width = FINGERPRINT_CONFIG.target_zone_width # Look ahead 75 time frames (reduced from 250)
+        self.target_zone_start = FINGERPRINT_CONFIG.target_zone_start # Start pairing from 1 frame ahead (capture nearby peaks)
     
     def load_audio(self, filepath: str, preprocess: bool = False) -> np.ndarray:
         """
@@ -74,7 +117,8 @@ class AudioFingerprinter:
         # - Converts to mono
         # - Resamples to target sample rate
         # - Returns float array normalized to [-1, 1]
-        audio, _ = librosa.load(filepath, sr=self.sample_rate, mono=True)
+        # float32 halves memory bandwidth through the STFT/peak-picking pipeline vs float64
+        audio, _ = librosa.load(filepath, sr=self.sample_rate, mono=True, dtype=np.float32)
         
         if preprocess:
             # Preprocessing steps for better matching (optional, slower)
@@ -105,7 +149,8 @@ class AudioFingerprinter:
         # Breaks audio into small chunks and applies FFT to each
         stft = librosa.stft(audio, 
                            n_fft=self.n_fft, 
-                           hop_length=self.hop_length)
+                           hop_length=self.hop_length,
+                           dtype=np.complex64)  # Single precision is plenty for peak picking
         # What this does:
         # 1. Takes the audio wave (time-domain)
         # 2. Splits it into overlapping windows of n_fft(2048) samples
@@ -186,6 +231,19 @@ class AudioFingerprinter:
         """
         hashes = []
         
+        if NUMBA_AVAILABLE and peaks:
+            # Fast path: pair enumeration runs in numba-compiled code, only hashing stays in Python
+            peak_array = np.asarray(peaks, dtype=np.int64)
+            anchor_time, anchor_freq, target_freq, time_delta = _pair_peaks(
+                peak_array[:, 0], peak_array[:, 1],
+                self.target_zone_start, self.target_zone_width, self.fan_value
+            )
+            for time1, freq1, freq2, delta in zip(anchor_time.tolist(), anchor_freq.tolist(),
+                                                  target_freq.tolist(), time_delta.tolist()):
+                hash_value = hashlib.sha1(f"{freq1}|{freq2}|{delta}".encode()).hexdigest()
+                hashes.append((hash_value, time1))
+            return hashes
+        
         for i, peak1 in enumerate(peaks):
             # For each peak, look at future peaks within target zone
             for j in range(i + self.target_zone_start, 
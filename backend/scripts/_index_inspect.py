@@ -0,0 +1,105 @@
+"""
+Shared catalog queries for the fingerprints index scripts.
+
+check_indexes.py, check_index_status.py and check_invalid_indexes.py are thin
+CLIs over these functions. Each function takes an open session (or connection)
+and returns plain rows; printing is left to the caller.
+"""
+
+from sqlalchemy import text
+
+
+# Indexed fingerprints columns (see app.models.Fingerprint) - the only pg_stats rows worth reading
+INDEXED_COLUMNS = ['id', 'hash_value', 'song_id']
+
+
+def prepare_session(session, timeout=True):
+    """
+    Tune the current transaction for short catalog reads.
+
+    JIT compilation costs more than these queries run for. The 5s statement
+    timeout makes a blocked catalog fail fast; pass timeout=False for callers
+    that may run an exact COUNT(*).
+    """
+    session.execute(text("SET LOCAL jit = off"))
+    if timeout:
+        session.execute(text("SET LOCAL statement_timeout = '5s'"))
+
+
+def list_indexes(session):
+    """(indexname, indexdef) for every index on fingerprints, ordered by name."""
+    return session.execute(text("""
+        SELECT indexname, indexdef
+        FROM pg_indexes
+        WHERE tablename = 'fingerprints'
+          AND schemaname = 'public'
+        ORDER BY indexname
+    """)).fetchall()
+
+
+def active_builds(session):
+    """(pid, query, state, duration_seconds) for running CREATE INDEX statements."""
+    return session.execute(text("""
+        SELECT
+            pid,
+            query,
+            state,
+            EXTRACT(EPOCH FROM (NOW() - query_start)) AS duration_seconds
+        FROM pg_stat_activity
+        WHERE query LIKE '%CREATE INDEX%'
+          AND state != 'idle'
+          AND pid != pg_backend_pid()
+        ORDER BY query_start
+    """)).fetchall()
+
+
+def fingerprint_count(session, exact=False):
+    """Fingerprint row count: exact COUNT(*) or the pg_class reltuples estimate."""
+    if exact:
+        return session.execute(text("SELECT COUNT(*) FROM fingerprints")).scalar()
+    return session.execute(text(
+        "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = 'fingerprints'::regclass"
+    )).scalar()
+
+
+def table_stats(session):
+    """(tablename, pretty_size, bytes) for songs and fingerprints, largest first."""
+    return session.execute(text("""
+        SELECT
+            tablename,
+            pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) AS size,
+            pg_total_relation_size(schemaname||'.'||tablename) AS bytes
+        FROM pg_tables
+        WHERE tablename IN ('songs', 'fingerprints')
+        ORDER BY bytes DESC
+    """)).fetchall()
+
+
+def index_usage(session):
+    """(indexrelname, idx_scan, idx_tup_read, idx_tup_fetch) for fingerprints indexes."""
+    return session.execute(text("""
+        SELECT indexrelname, idx_scan, idx_tup_read, idx_tup_fetch
+        FROM pg_stat_user_indexes
+        WHERE relname = 'fingerprints'
+    """)).fetchall()
+
+
+def locks(session):
+    """(locktype, mode, granted, pid) for locks held or awaited on fingerprints."""
+    return session.execute(text("""
+        SELECT locktype, mode, granted, pid
+        FROM pg_locks
+        WHERE relation = 'fingerprints'::regclass
+    """)).fetchall()
+
+
+def column_stats(session, columns=INDEXED_COLUMNS):
+    """(attname, n_distinct, correlation) from pg_stats for the given fingerprints columns."""
+    return session.execute(text("""
+        SELECT attname, n_distinct, correlation
+        FROM pg_stats
+        WHERE tablename = 'fingerprints'
+          AND schemaname = 'public'
+          AND attname = ANY(:cols)
+        ORDER BY attname
+    """), {"cols": list(columns)}).fetchall()
@@ -107,7 +107,7 @@ def get_audio_files(directory: str):
         raise ValueError(f"Directory not found: {audio_dir}")
     
     # Audio file extensions
-    audio_extensions = {'.mp3', '.wav', '.flac', '.m4a', '.ogg'}
+    audio_extensions = {'.mp3', '.wav', '.flac', '.m4a', '.ogg', '.opus'}
     
     # Get all audio files recursively
     audio_files = []
@@ -12,8 +12,10 @@ import os
 import argparse
 from pathlib import Path
 import re
-from multiprocessing import Pool, cpu_count, Manager, current_process
+import multiprocessing
+from multiprocessing import Pool, Value, cpu_count, current_process
 from functools import partial
+from itertools import chain
 import time
 import logging
 from datetime import datetime
@@ -25,13 +27,20 @@ sys.path.insert(0, str(backend_dir))
 
 from app.fingerprint import AudioFingerprinter
 from app.database import DatabaseManager
+from sqlalchemy import text
+try:
+    import psutil  # Only needed for CPU pinning on platforms without os.sched_setaffinity
+except ImportError:
+    psutil = None
+
+# Connections left free for the API server, psql and monitoring scripts
+CONNECTION_RESERVE = 5
 
 
 def clean_text(text):
     """Clean underscores and extra spaces."""
-    text = text.replace('_', ' ')
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    # str.split() collapses and trims all whitespace in one C-level pass (no regex)
+    return ' '.join(text.replace('_', ' ').split())
 
 
 def parse_title_artist(filename: str):
@@ -106,14 +115,90 @@ def parse_title_artist(filename: str):
 
 
 def iter_audio_files(audio_dir: Path):
-    """Recursively find all audio files in directory."""
+    """
+    Recursively find all audio files in directory.
+    
+    Lazy (no up-front sort) so files can be handed to workers while the
+    directory walk is still running.
+    """
     exts = {".mp3", ".wav", ".flac", ".ogg", ".m4a", ".opus", ".webm"}
-    for path in sorted(audio_dir.rglob("*")):
+    for path in audio_dir.rglob("*"):
         if path.suffix.lower() in exts:
             yield path
 
 
-def process_single_song(audio_path, args, counter, lock):
+def _count_discovered(paths, total):
+    """Yield paths unchanged while bumping the shared total for progress display."""
+    for path in paths:
+        with total.get_lock():
+            total.value += 1
+        yield path
+
+
+# Per-worker globals, set once by _init_worker when the pool starts
+_counter = None
+_total = None
+_fingerprinter = None
+
+
+def _init_worker(counter, total, fingerprinter):
+    """
+    Pool initializer: receive the shared state once per worker.
+    
+    total is a shared Value that keeps growing while files are still being discovered.
+    
+    With the fork start method the fingerprinter (and the already-imported
+    librosa/numpy modules) are inherited from the parent via copy-on-write pages.
+    """
+    global _counter, _total, _fingerprinter
+    _counter = counter
+    _total = total
+    _fingerprinter = fingerprinter
+    _pin_worker()
+
+
+def _pin_worker():
+    """
+    Pin this worker to its own core and lower its priority.
+    
+    Keeping an FFT-heavy worker on one core keeps its caches warm between STFT
+    frames; nice(5) stops a bulk load from starving interactive work.
+    """
+    identity = current_process()._identity
+    if not identity:
+        return
+    
+    # Pick from the CPUs this process may use, not 0..cpu_count-1: in a
+    # cpuset-restricted container (e.g. --cpuset-cpus=4-7) core 0 isn't allowed
+    try:
+        if hasattr(os, 'sched_setaffinity'):
+            cores = sorted(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, {cores[(identity[0] - 1) % len(cores)]})
+        elif psutil is not None:
+            process = psutil.Process()
+            cores = sorted(process.cpu_affinity())
+            process.cpu_affinity([cores[(identity[0] - 1) % len(cores)]])
+    except (OSError, ValueError, AttributeError):
+        pass  # Affinity can't be set here - run unpinned
+    
+    # Separate from pinning, so a failed affinity call still lowers the priority
+    try:
+        if hasattr(os, 'nice'):
+            os.nice(5)
+        elif psutil is not None:
+            psutil.Process().nice(psutil.BELOW_NORMAL_PRIORITY_CLASS)
+    except (OSError, ValueError, AttributeError):
+        pass
+
+
+def _next_count() -> int:
+    """Increment the shared progress counter and return the new value."""
+    with _counter.get_lock():
+        _counter.value += 1
+        return _counter.value
+
+
+def process_single_song(audio_path, args):
     """
     Process a single song (fingerprint and add to database).
     This function is called by multiple processes in parallel.
@@ -121,8 +206,6 @@ def process_single_song(audio_path, args, counter, lock):
     Args:
         audio_path: Path to audio file
         args: Arguments containing database URL and fingerprinting params
-        counter: Shared counter for progress tracking
-        lock: Lock for thread-safe counter updates
         
     Returns:
         Tuple: (status, message) where status is 'added', 'skipped', or 'failed'
@@ -142,14 +225,8 @@ def process_single_song(audio_path, args, counter, lock):
         return msg
     
     try:
-        # Initialize fingerprinter (each process needs its own)
-        fp = AudioFingerprinter(
-            sample_rate=args.sample_rate,
-            n_fft=args.n_fft,
-            hop_length=args.hop_length,
-            freq_min=args.freq_min,
-            freq_max=args.freq_max,
-        )
+        # Fingerprinter is built once in the parent and handed over by _init_worker
+        fp = _fingerprinter
         
         # Initialize database connection (each process needs its own)
         db = DatabaseManager(database_url=args.database_url)
@@ -158,11 +235,13 @@ def process_single_song(audio_path, args, counter, lock):
             # Generate fingerprints
             hashes = fp.fingerprint_file(str(audio_path))
             
+            # Drop repeated (hash, offset) pairs from repeated peak pairs - fewer rows on the wire
+            # and in the index. dict.fromkeys keeps first-seen order and is exact for str hashes.
+            hashes = list(dict.fromkeys(hashes))
+            
             if not hashes:
-                with lock:
-                    counter.value += 1
-                    current = counter.value
-                return ('failed', f"[Worker-{worker_id}] [{current}/{counter.total}] {audio_path.name}: No fingerprints generated")
+                current = _next_count()
+                return ('failed', f"[Worker-{worker_id}] [{current}/{_total.value}] {audio_path.name}: No fingerprints generated")
             
             # Parse metadata from filename
             title, artist = parse_title_artist(audio_path.name)
@@ -177,25 +256,40 @@ def process_single_song(audio_path, args, counter, lock):
                 filepath=str(audio_path),
             )
             
-            with lock:
-                counter.value += 1
-                current = counter.value
+            current = _next_count()
             
             if song_id:
-                msg = f"[Worker-{worker_id}] [{current}/{counter.total}] ✓ '{title}' by {artist} (ID: {song_id}, {len(hashes)} fps)"
+                msg = f"[Worker-{worker_id}] [{current}/{_total.value}] ✓ '{title}' by {artist} (ID: {song_id}, {len(hashes)} fps)"
                 return ('added', log_worker(msg))
             else:
-                msg = f"[Worker-{worker_id}] [{current}/{counter.total}] Already exists: {title}"
+                msg = f"[Worker-{worker_id}] [{current}/{_total.value}] Already exists: {title}"
                 return ('skipped', log_worker(msg))
         finally:
             # Always close database connection to avoid "too many clients" error
             db.close()
             
     except Exception as exc:
-        with lock:
-            counter.value += 1
-            current = counter.value
-        return ('failed', f"[Worker-{worker_id}] [{current}/{counter.total}] ✗ Error: {str(exc)[:100]}")
+        current = _next_count()
+        return ('failed', f"[Worker-{worker_id}] [{current}/{_total.value}] ✗ Error: {str(exc)[:100]}")
+
+
+def get_connection_headroom(database_url: str = None) -> int:
+    """
+    Number of additional connections PostgreSQL can accept right now.
+    
+    Each worker holds its own connection, so max_connections (not CPU count)
+    is the real ceiling on parallelism.
+    """
+    db = DatabaseManager(database_url=database_url)
+    try:
+        with db.engine.connect() as conn:
+            free = conn.execute(text("""
+                SELECT (SELECT setting::int FROM pg_settings WHERE name = 'max_connections')
+                     - (SELECT count(*) FROM pg_stat_activity)
+            """)).scalar()
+    finally:
+        db.close()
+    return free - CONNECTION_RESERVE
 
 
 def add_songs_parallel(args):
@@ -205,49 +299,67 @@ def add_songs_parallel(args):
     if not audio_dir.exists():
         raise SystemExit(f"Audio directory not found: {audio_dir}")
 
-    # Find all audio files
-    audio_files = list(iter_audio_files(audio_dir))
-    if not audio_files:
+    # Discover files lazily; the pool's task feeder walks the directory while
+    # workers are already fingerprinting, so wall time ~= max(discover, process)
+    audio_files = iter_audio_files(audio_dir)
+    first_file = next(audio_files, None)
+    if first_file is None:
         print(f"No audio files found in {audio_dir}")
         return
 
-    print(f"Found {len(audio_files)} audio files")
+    # Clamp workers to the smallest resource: CPU cores or free DB connections
+    headroom = get_connection_headroom(args.database_url)
+    if args.workers is None:
+        args.workers = max(1, min(cpu_count(), headroom))
+    elif args.workers > headroom:
+        print(f"⚠️  Only {headroom} database connections available, reducing workers from {args.workers}")
+        args.workers = max(1, headroom)
+
     print(f"Audio directory: {audio_dir}")
     print(f"Database: {os.getenv('DATABASE_URL', 'default')}")
     print(f"Workers: {args.workers}")
-    print(f"Processing songs in parallel...")
+    print(f"Discovering and processing songs in parallel...")
     print("=" * 60)
 
     # Track statistics
     stats = {
-        'total': len(audio_files),
+        'total': 0,
         'added': 0,
         'skipped': 0,
         'failed': 0
     }
 
-    # Create shared counter for progress tracking
-    manager = Manager()
-    counter = manager.Namespace()
-    counter.value = 0
-    counter.total = len(audio_files)
-    lock = manager.Lock()
+    # Shared progress counters in shared memory (no Manager process, no IPC per increment)
+    counter = Value('i', 0)
+    total = Value('i', 0)
+
+    # Build the fingerprinter once; workers inherit it instead of rebuilding per song
+    fingerprinter = AudioFingerprinter(
+        sample_rate=args.sample_rate,
+        n_fft=args.n_fft,
+        hop_length=args.hop_length,
+        freq_min=args.freq_min,
+        freq_max=args.freq_max,
+    )
 
     # Create partial function with fixed args
-    process_func = partial(process_single_song, args=args, counter=counter, lock=lock)
+    process_func = partial(process_single_song, args=args)
 
     # Process songs in parallel with real-time progress
     start_time = time.time()
     
     print()
     
-    with Pool(processes=args.workers) as pool:
-        # Use imap_unordered for real-time results
-        for status, message in pool.imap_unordered(process_func, audio_files, chunksize=1):
+    with Pool(processes=args.workers, initializer=_init_worker,
+              initargs=(counter, total, fingerprinter)) as pool:
+        # Use imap_unordered for real-time results; the generator is consumed as paths are found
+        discovered = _count_discovered(chain([first_file], audio_files), total)
+        for status, message in pool.imap_unordered(process_func, discovered, chunksize=1):
             print(message)
             stats[status] += 1
     
     elapsed_time = time.time() - start_time
+    stats['total'] = total.value
 
     # Print separator after results
     print()
@@ -263,7 +375,7 @@ def add_songs_parallel(args):
     print(f"Skipped (duplicates):  {stats['skipped']}")
     print(f"Failed:                {stats['failed']}")
     print(f"Total time:            {elapsed_time:.1f}s ({elapsed_time/60:.1f} minutes)")
-    print(f"Average per song:      {elapsed_time/len(audio_files):.2f}s")
+    print(f"Average per song:      {elapsed_time/stats['total']:.2f}s")
     print()
     
     if stats['added'] > 0:
@@ -276,6 +388,11 @@ def add_songs_parallel(args):
 
 def main():
     """Main entry point with argument parsing."""
+    # Fork lets workers inherit the loaded librosa/numpy modules instead of
+    # re-importing them (~500ms each). Windows only supports spawn.
+    if sys.platform != 'win32':
+        multiprocessing.set_start_method('fork', force=True)
+    
     default_audio_dir = Path(__file__).resolve().parents[2] / "youtube_songs"
     default_workers = 3  # Reduced to avoid PostgreSQL connection limit
 
@@ -293,7 +410,7 @@ Examples:
   # Process specific directory
   python add_songs_parallel.py --workers 6 --audio-dir ./youtube_songs
   
-  # Use auto-detected CPU count (capped at 8)
+  # Use CPU count, capped by free PostgreSQL connections
   python add_songs_parallel.py --workers auto
         """
     )
@@ -312,7 +429,7 @@ Examples:
         "--workers",
         type=str,
         default=str(default_workers),
-        help=f"Number of parallel workers (default: {default_workers}, use 'auto' for CPU count)"
+        help=f"Number of parallel workers (default: {default_workers}, use 'auto' for CPU count capped by free DB connections)"
     )
     
     # Fingerprinting parameters (defaults match current configuration)
@@ -326,7 +443,7 @@ Examples:
     
     # Parse workers argument
     if args.workers.lower() == 'auto':
-        args.workers = default_workers
+        args.workers = None  # Resolved against max_connections headroom at startup
     else:
         args.workers = int(args.workers)
         if args.workers < 1:
@@ -9,6 +9,7 @@ from app.database import DatabaseManager
 from app.fingerprint import AudioFingerprinter
 import time
 import random
+from operator import attrgetter
 
 def benchmark_identification():
     """Test identification speed with current optimizations"""
@@ -44,8 +45,8 @@ def benchmark_identification():
         print("No fingerprints found!")
         return
     
-    # Convert to list of tuples
-    query_fingerprints = [(fp.hash_value, fp.time_offset) for fp in song_fingerprints]
+    # Convert to list of tuples (attrgetter pulls both fields in C, no per-row bytecode)
+    query_fingerprints = list(map(attrgetter('hash_value', 'time_offset'), song_fingerprints))
     
     print(f"\n{'='*60}")
     print(f"SPEED BENCHMARK")
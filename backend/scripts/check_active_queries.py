@@ -14,27 +14,41 @@ from app.database import DatabaseManager
 from sqlalchemy import text
 
 
+# Both lists are aggregated server-side so the script needs a single round-trip.
+# Active queries come back as [pid, usename, application_name, state, query, duration] arrays.
+ACTIVITY_SQL = """
+    WITH q AS (
+        SELECT COALESCE(json_agg(json_build_array(
+                   pid,
+                   usename,
+                   application_name,
+                   state,
+                   query,
+                   (now() - query_start)::text
+               ) ORDER BY query_start), '[]'::json) AS rows
+        FROM pg_stat_activity
+        WHERE state = 'active'
+        AND pid != pg_backend_pid()
+    ),
+    p AS (
+        SELECT COALESCE(json_agg(p), '[]'::json) AS rows
+        FROM pg_stat_progress_create_index p
+    )
+    SELECT q.rows, p.rows FROM q, p;
+"""
+
+
 def check_now():
     db = DatabaseManager()
     session = db.get_session()
     
     try:
-        # Check all active queries
-        result = session.execute(text("""
-            SELECT 
-                pid,
-                usename,
-                application_name,
-                state,
-                query,
-                now() - query_start AS duration
-            FROM pg_stat_activity
-            WHERE state = 'active'
-            AND pid != pg_backend_pid()
-            ORDER BY query_start;
-        """))
+        # Catalog reads only: skip JIT compilation (it costs more than these queries
+        # run for) and fail fast instead of queueing behind a lock
+        session.execute(text("SET LOCAL jit = off; SET LOCAL statement_timeout = '5s'"))
         
-        queries = result.fetchall()
+        # Active queries and index build progress in one round-trip
+        queries, index_progress = session.execute(text(ACTIVITY_SQL)).one()
         
         if queries:
             print(f"Found {len(queries)} active queries:\n")
@@ -49,12 +63,6 @@ def check_now():
         else:
             print("No active queries found (besides this one)")
         
-        # Check specifically for index creation
-        result = session.execute(text("""
-            SELECT * FROM pg_stat_progress_create_index;
-        """))
-        
-        index_progress = result.fetchall()
         if index_progress:
             print(f"\nActive index creation: {len(index_progress)}")
             for idx in index_progress:
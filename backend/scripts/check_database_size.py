@@ -1,13 +1,34 @@
 import sys
 import os
+import argparse
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import DatabaseManager
 from sqlalchemy import text
 
+
+def _approx_count(session, table: str) -> int:
+    """Row count from the planner statistics in pg_class (one catalog row, no table scan)."""
+    return session.execute(
+        text("SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = to_regclass(:table)"),
+        {"table": table}
+    ).scalar() or 0
+
+
+parser = argparse.ArgumentParser(description="Show database size breakdown")
+parser.add_argument("--exact", action="store_true",
+                    help="Count fingerprints exactly with COUNT(*) (slow on large tables)")
+args = parser.parse_args()
+
 db = DatabaseManager()
 session = db.get_session()
 
+# Skip JIT compilation for these short catalog reads; no statement timeout with
+# --exact, where COUNT(*) can legitimately run for minutes
+session.execute(text("SET LOCAL jit = off"))
+if not args.exact:
+    session.execute(text("SET LOCAL statement_timeout = '5s'"))
+
 # Get table sizes
 result = session.execute(text("""
     SELECT 
@@ -26,8 +47,13 @@ print(f"Fingerprints overhead (TOAST):{result[3]}")
 print(f"=" * 60)
 
 # Calculate per-fingerprint cost
-total_fps = session.execute(text("SELECT COUNT(*) FROM fingerprints")).scalar()
-print(f"\nTotal fingerprints: {total_fps:,}")
-print(f"Average per fingerprint: ~{54 * 1024 / (total_fps / 1000000):.2f} KB")
+if args.exact:
+    total_fps = session.execute(text("SELECT COUNT(*) FROM fingerprints")).scalar()
+    print(f"\nTotal fingerprints: {total_fps:,}")
+else:
+    total_fps = _approx_count(session, 'fingerprints')
+    print(f"\nTotal fingerprints: ~{total_fps:,} (estimate)")
+if total_fps:
+    print(f"Average per fingerprint: ~{54 * 1024 / (total_fps / 1000000):.2f} KB")
 
 session.close()
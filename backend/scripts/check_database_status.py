@@ -4,6 +4,7 @@ Check current database status: indexes, songs, fingerprints.
 
 import sys
 import os
+import argparse
 from pathlib import Path
 
 script_dir = Path(__file__).parent
@@ -14,25 +15,78 @@ from app.database import DatabaseManager
 from sqlalchemy import text
 
 
-def check_status():
-    """Check database status and indexes."""
+# Exact COUNT(*) is a full scan of a multi-million row table; the planner's
+# reltuples estimate is a single catalog row and is close enough for a status report.
+# reltuples is -1 on a never-analyzed table, hence the GREATEST.
+EXACT_FINGERPRINT_COUNT = "SELECT COUNT(*) AS c FROM fingerprints"
+APPROX_FINGERPRINT_COUNT = """
+        SELECT GREATEST(reltuples, 0)::bigint AS c
+        FROM pg_class
+        WHERE oid = 'fingerprints'::regclass
+"""
+
+# One query, one round-trip: each CTE returns a single row so the cross join is 1x1x1x1.
+# Index and activity rows come back as JSON arrays ([name, def, size] / [pid, query, state, duration]).
+STATUS_SQL = """
+    WITH s AS (
+        SELECT COUNT(*) AS c FROM songs
+    ),
+    f AS (
+        {fingerprint_count}
+    ),
+    i AS (
+        SELECT COALESCE(json_agg(json_build_array(
+                   indexname,
+                   indexdef,
+                   pg_size_pretty(pg_relation_size(indexname::regclass))
+               ) ORDER BY indexname), '[]'::json) AS rows
+        FROM pg_indexes
+        WHERE tablename = 'fingerprints'
+    ),
+    a AS (
+        SELECT COALESCE(json_agg(json_build_array(
+                   pid, query, state, (now() - query_start)::text
+               )), '[]'::json) AS rows
+        FROM pg_stat_activity
+        WHERE (query LIKE '%CREATE INDEX%' OR query LIKE '%fingerprints%')
+        AND state = 'active'
+        AND pid != pg_backend_pid()
+    )
+    SELECT s.c, f.c, i.rows, a.rows FROM s, f, i, a;
+"""
+
+
+def check_status(exact: bool = False):
+    """
+    Check database status and indexes.
+    
+    Args:
+        exact: Use COUNT(*) for the fingerprints table instead of the pg_class estimate
+    """
     db = DatabaseManager()
     session = db.get_session()
     
     try:
+        # Skip JIT compilation for these short catalog reads; the statement timeout
+        # is left off with --exact, where COUNT(*) can legitimately run for minutes
+        session.execute(text("SET LOCAL jit = off"))
+        if not exact:
+            session.execute(text("SET LOCAL statement_timeout = '5s'"))
+        
         print("=" * 60)
         print("DATABASE STATUS")
         print("=" * 60)
         
-        # Check songs count
-        result = session.execute(text("SELECT COUNT(*) FROM songs;"))
-        songs_count = result.scalar()
-        print(f"\n📊 Songs in database: {songs_count:,}")
+        # Fetch counts, indexes and active operations in a single round-trip
+        fingerprint_count_sql = EXACT_FINGERPRINT_COUNT if exact else APPROX_FINGERPRINT_COUNT
+        row = session.execute(text(STATUS_SQL.format(fingerprint_count=fingerprint_count_sql))).one()
+        songs_count, fingerprints_count, indexes, active = row
         
-        # Check fingerprints count
-        result = session.execute(text("SELECT COUNT(*) FROM fingerprints;"))
-        fingerprints_count = result.scalar()
-        print(f"📊 Fingerprints in database: {fingerprints_count:,}")
+        print(f"\n📊 Songs in database: {songs_count:,}")
+        if exact:
+            print(f"📊 Fingerprints in database: {fingerprints_count:,}")
+        else:
+            print(f"📊 Fingerprints in database: ~{fingerprints_count:,} (estimate, use --exact for COUNT)")
         
         if songs_count > 0:
             avg_fingerprints = fingerprints_count / songs_count
@@ -43,18 +97,6 @@ def check_status():
         print("INDEXES ON FINGERPRINTS TABLE")
         print("=" * 60)
         
-        result = session.execute(text("""
-            SELECT 
-                indexname, 
-                indexdef,
-                pg_size_pretty(pg_relation_size(indexname::regclass)) as index_size
-            FROM pg_indexes
-            WHERE tablename = 'fingerprints'
-            ORDER BY indexname;
-        """))
-        
-        indexes = result.fetchall()
-        
         if not indexes:
             print("\n⚠️  NO INDEXES FOUND!")
             print("    This is normal during bulk insert.")
@@ -90,17 +132,6 @@ def check_status():
         print("ACTIVE OPERATIONS")
         print("=" * 60)
         
-        result = session.execute(text("""
-            SELECT pid, query, state, now() - query_start as duration
-            FROM pg_stat_activity
-            WHERE query LIKE '%CREATE INDEX%'
-            OR query LIKE '%fingerprints%'
-            AND state = 'active'
-            AND pid != pg_backend_pid();
-        """))
-        
-        active = result.fetchall()
-        
         if not active:
             print("\n✓ No active index operations")
         else:
@@ -134,4 +165,9 @@ def check_status():
 
 
 if __name__ == "__main__":
-    check_status()
+    parser = argparse.ArgumentParser(description="Check database status and indexes")
+    parser.add_argument("--exact", action="store_true",
+                        help="Count fingerprints exactly with COUNT(*) (slow on large tables)")
+    args = parser.parse_args()
+    
+    check_status(exact=args.exact)
@@ -7,33 +7,121 @@ import sys
 import os
 from pathlib import Path
 import time
+import threading
 
 script_dir = Path(__file__).parent
 backend_dir = script_dir.parent
 sys.path.insert(0, str(backend_dir))
 
-from app.database import DatabaseManager
+from app.database import get_db
 from sqlalchemy import text
 
 
-def check_index_status():
-    """Check which indexes exist and their status."""
-    db = DatabaseManager()
-    session = db.get_session()
+# One statement for the whole status refresh. Each section is aggregated to JSON
+# arrays so the print code can keep indexing rows positionally.
+# SET LOCAL caps the refresh at 2s so a blocked catalog can't stall the monitor,
+# and turns JIT off - compiling costs more than these small catalog reads run for.
+# The table is bound by OID (resolved once, see _fingerprints_oid) rather than
+# re-resolved from its name by every section.
+INDEX_STATUS_SQL = """
+    SET LOCAL statement_timeout = '2s';
+    SET LOCAL jit = off;
+    WITH idx AS (
+        SELECT
+            i.indexrelid::regclass::text AS indexname,
+            i.indrelid::regclass::text AS tablename,
+            pg_size_pretty(pg_relation_size(i.indexrelid)) AS size
+        FROM pg_index i
+        WHERE i.indrelid = CAST(:oid AS oid)
+    ),
+    ops AS (
+        SELECT
+            pid,
+            state,
+            wait_event_type,
+            wait_event,
+            query,
+            (NOW() - query_start)::text AS duration,
+            query_start
+        FROM pg_stat_activity
+        WHERE query LIKE '%CREATE INDEX%'
+            AND state != 'idle'
+            AND pid != pg_backend_pid()
+    ),
+    stats AS (
+        SELECT
+            n_tup_ins AS inserts,
+            n_tup_upd AS updates,
+            n_tup_del AS deletes,
+            n_live_tup AS live_rows,
+            n_dead_tup AS dead_rows,
+            pg_size_pretty(pg_total_relation_size(CAST(:oid AS regclass))) AS total_size
+        FROM pg_stat_user_tables
+        WHERE relid = CAST(:oid AS oid)
+    ),
+    locks AS (
+        SELECT
+            l.pid,
+            l.mode,
+            l.granted,
+            a.query,
+            (NOW() - a.query_start)::text AS duration,
+            a.query_start
+        FROM pg_locks l
+        JOIN pg_stat_activity a ON l.pid = a.pid
+        WHERE l.relation = CAST(:oid AS oid)
+    )
+    SELECT json_build_object(
+        'indexes', (SELECT COALESCE(json_agg(json_build_array(indexname, tablename, size)
+                                             ORDER BY indexname), '[]'::json) FROM idx),
+        'active_ops', (SELECT COALESCE(json_agg(json_build_array(pid, state, wait_event_type, wait_event,
+                                                                 query, duration)
+                                                ORDER BY query_start), '[]'::json) FROM ops),
+        'stats', (SELECT json_build_array(inserts, updates, deletes, live_rows, dead_rows, total_size)
+                  FROM stats),
+        'locks', (SELECT COALESCE(json_agg(json_build_array(pid, mode, granted, query, duration)
+                                           ORDER BY query_start), '[]'::json) FROM locks)
+    );
+"""
+
+# OID of the fingerprints table, looked up on first use and reused by every refresh
+_fingerprints_oid_cache = None
+
+
+def _fingerprints_oid(session):
+    """Resolve 'fingerprints'::regclass once per process."""
+    global _fingerprints_oid_cache
+    if _fingerprints_oid_cache is None:
+        _fingerprints_oid_cache = session.execute(
+            text("SELECT 'fingerprints'::regclass::oid")
+        ).scalar()
+    return _fingerprints_oid_cache
+
+
+def check_index_status(session=None):
+    """
+    Check which indexes exist and their status.
+    
+    Args:
+        session: Open session or connection to reuse across calls (monitor_progress
+            passes one); when omitted a session is opened and closed here
+    
+    Returns:
+        Tuple of fetched rows (indexes, active_ops, stats, locks), or None on error
+    """
+    own_session = session is None
+    if own_session:
+        session = get_db().get_session()
     
     try:
-        # Check if indexes exist
-        result = session.execute(text("""
-            SELECT 
-                indexname,
-                tablename,
-                pg_size_pretty(pg_relation_size(indexname::regclass)) as size
-            FROM pg_indexes
-            WHERE tablename = 'fingerprints'
-            ORDER BY indexname;
-        """))
-        
-        indexes = result.fetchall()
+        # All four catalog reads in one round-trip and one MVCC snapshot
+        status = session.execute(
+            text(INDEX_STATUS_SQL), {"oid": _fingerprints_oid(session)}
+        ).scalar()
+        indexes = status['indexes']
+        active_ops = status['active_ops']
+        stats = status['stats']
+        locks = status['locks']
         
         print("=" * 70)
         print("CURRENT INDEXES ON fingerprints TABLE:")
@@ -45,23 +133,6 @@ def check_index_status():
             print("  No indexes found on fingerprints table")
         print()
         
-        # Check for active index creation
-        result = session.execute(text("""
-            SELECT 
-                pid,
-                state,
-                wait_event_type,
-                wait_event,
-                query,
-                NOW() - query_start as duration
-            FROM pg_stat_activity
-            WHERE query LIKE '%CREATE INDEX%'
-                AND state != 'idle'
-            ORDER BY query_start;
-        """))
-        
-        active_ops = result.fetchall()
-        
         print("ACTIVE INDEX OPERATIONS:")
         print("=" * 70)
         if active_ops:
@@ -76,21 +147,6 @@ def check_index_status():
             print("  No active index creation operations")
         print()
         
-        # Check table stats
-        result = session.execute(text("""
-            SELECT 
-                n_tup_ins as inserts,
-                n_tup_upd as updates,
-                n_tup_del as deletes,
-                n_live_tup as live_rows,
-                n_dead_tup as dead_rows,
-                pg_size_pretty(pg_total_relation_size('fingerprints')) as total_size
-            FROM pg_stat_user_tables
-            WHERE relname = 'fingerprints';
-        """))
-        
-        stats = result.fetchone()
-        
         print("TABLE STATISTICS:")
         print("=" * 70)
         if stats:
@@ -102,22 +158,6 @@ def check_index_status():
             print(f"  Total deletes: {stats[2]:,}")
         print()
         
-        # Check for locks
-        result = session.execute(text("""
-            SELECT 
-                l.pid,
-                l.mode,
-                l.granted,
-                a.query,
-                NOW() - a.query_start as duration
-            FROM pg_locks l
-            JOIN pg_stat_activity a ON l.pid = a.pid
-            WHERE l.relation = 'fingerprints'::regclass
-            ORDER BY a.query_start;
-        """))
-        
-        locks = result.fetchall()
-        
         print("ACTIVE LOCKS ON fingerprints TABLE:")
         print("=" * 70)
         if locks:
@@ -129,33 +169,94 @@ def check_index_status():
         else:
             print("  No locks found")
         
+        return indexes, active_ops, stats, locks
+        
     except Exception as e:
         print(f"Error checking status: {e}")
+        return None
     finally:
-        session.close()
+        if own_session:
+            session.close()
+        else:
+            # End the transaction: pg_stat_* values are cached per transaction, so
+            # the next refresh would otherwise see the same numbers
+            session.rollback()
+
+
+def _snapshot_key(snapshot):
+    """
+    Reduce a check_index_status() result to the parts that signal progress.
+    
+    Durations (NOW() - query_start) change on every call, so they are dropped;
+    everything else (index sizes, active PIDs/wait events, row counters, locks)
+    only changes when something actually happened.
+    """
+    if snapshot is None:
+        return None
+    indexes, active_ops, stats, locks = snapshot
+    return (
+        tuple(tuple(idx) for idx in indexes),
+        tuple(tuple(op[:5]) for op in active_ops),
+        tuple(stats) if stats else None,
+        tuple(tuple(lock[:4]) for lock in locks),
+    )
+
 
+def _clear():
+    """Clear the terminal with ANSI escapes instead of spawning cls/clear."""
+    sys.stdout.write("\x1b[2J\x1b[H")
+    sys.stdout.flush()
 
-def monitor_progress(interval=5, iterations=None):
-    """Monitor progress continuously."""
+
+def monitor_progress(interval=5, iterations=None, max_interval=60, backoff_factor=2.0):
+    """
+    Monitor progress continuously.
+    
+    Polls every `interval` seconds while something is changing. Each refresh
+    that returns the same snapshot as the previous one multiplies the wait by
+    `backoff_factor` (capped at `max_interval`), so an idle watch stops hammering
+    the catalog; any change resets the wait to `interval`.
+    """
     iteration = 0
+    current_interval = interval
+    last_key = None
+    stop = threading.Event()  # wait() instead of sleep() keeps Ctrl+C responsive
+    
+    try:
+        # Legacy Windows consoles need this to honour the ANSI clear; no-op elsewhere
+        from colorama import just_fix_windows_console
+        just_fix_windows_console()
+    except ImportError:
+        pass
+    
+    # One connection for the whole watch instead of a pool checkout (and ping) per refresh
+    conn = get_db().engine.connect()
     
     try:
         while True:
-            os.system('cls' if os.name == 'nt' else 'clear')
+            _clear()
             print(f"Index Rebuild Monitor - {time.strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"Refreshing every {interval} seconds... (Ctrl+C to stop)")
+            print(f"Polling every {interval}-{max_interval} seconds, backing off while idle... (Ctrl+C to stop)")
             print()
             
-            check_index_status()
+            key = _snapshot_key(check_index_status(conn))
+            if key is not None and key == last_key:
+                current_interval = min(current_interval * backoff_factor, max_interval)
+            else:
+                current_interval = interval
+            last_key = key
             
             iteration += 1
             if iterations and iteration >= iterations:
                 break
-                
-            time.sleep(interval)
+            
+            print(f"\nNext refresh in {current_interval:.0f}s")
+            stop.wait(current_interval)
             
     except KeyboardInterrupt:
         print("\nMonitoring stopped.")
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
@@ -164,10 +265,15 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Monitor index rebuild progress")
     parser.add_argument("--watch", action="store_true", help="Continuously monitor (refresh every 5s)")
     parser.add_argument("--interval", type=int, default=5, help="Refresh interval in seconds (default: 5)")
+    parser.add_argument("--max-interval", type=int, default=60,
+                        help="Longest refresh interval while nothing changes (default: 60)")
+    parser.add_argument("--backoff-factor", type=float, default=2.0,
+                        help="Interval multiplier applied after each unchanged refresh (default: 2.0)")
     
     args = parser.parse_args()
     
     if args.watch:
-        monitor_progress(interval=args.interval)
+        monitor_progress(interval=args.interval, max_interval=args.max_interval,
+                         backoff_factor=args.backoff_factor)
     else:
         check_index_status()
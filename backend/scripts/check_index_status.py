@@ -9,29 +9,28 @@ script_dir = Path(__file__).parent
 backend_dir = script_dir.parent
 sys.path.insert(0, str(backend_dir))
 
-from app.database import DatabaseManager
-from sqlalchemy import text
+from app.database import get_db
+from _index_inspect import (
+    prepare_session, list_indexes, active_builds, fingerprint_count, table_stats
+)
 
 
-def check_indexes():
-    """Check current index status in the database."""
-    db = DatabaseManager()
+def check_indexes(exact=False):
+    """
+    Check current index status in the database.
+    
+    Args:
+        exact: Count fingerprints with COUNT(*) instead of the pg_class estimate
+    """
+    db = get_db()
     session = db.get_session()
     
     try:
-        print("Checking fingerprints table indexes...\n")
+        prepare_session(session, timeout=not exact)
         
-        # Get all indexes on the fingerprints table
-        result = session.execute(text("""
-            SELECT 
-                indexname,
-                indexdef
-            FROM pg_indexes 
-            WHERE tablename = 'fingerprints'
-            ORDER BY indexname;
-        """))
+        print("Checking fingerprints table indexes...\n")
         
-        indexes = result.fetchall()
+        indexes = list_indexes(session)
         
         if indexes:
             print(f"Found {len(indexes)} indexes on fingerprints table:\n")
@@ -44,19 +43,7 @@ def check_indexes():
         
         # Check for ongoing index creation
         print("\nChecking for active index creation processes...")
-        result = session.execute(text("""
-            SELECT 
-                pid,
-                query,
-                state,
-                EXTRACT(EPOCH FROM (NOW() - query_start)) as duration_seconds
-            FROM pg_stat_activity 
-            WHERE query LIKE '%CREATE INDEX%' 
-              AND query NOT LIKE '%pg_stat_activity%'
-              AND state != 'idle';
-        """))
-        
-        active = result.fetchall()
+        active = active_builds(session)
         
         if active:
             print(f"Found {len(active)} active index creation process(es):\n")
@@ -75,18 +62,14 @@ def check_indexes():
         
         # Get row count to understand scale
         print("Checking fingerprints table size...")
-        result = session.execute(text("""
-            SELECT COUNT(*) FROM fingerprints;
-        """))
-        count = result.scalar()
-        print(f"  Total fingerprints: {count:,}")
+        count = fingerprint_count(session, exact=exact)
+        if exact:
+            print(f"  Total fingerprints: {count:,}")
+        else:
+            print(f"  Total fingerprints: ~{count:,} rows (estimate, use --exact for COUNT(*))")
         
-        # Get table size
-        result = session.execute(text("""
-            SELECT pg_size_pretty(pg_total_relation_size('fingerprints')) as size;
-        """))
-        size = result.scalar()
-        print(f"  Table size: {size}\n")
+        sizes = {name: size for name, size, _ in table_stats(session)}
+        print(f"  Table size: {sizes.get('fingerprints')}\n")
         
     except Exception as e:
         print(f"Error checking indexes: {e}")
@@ -97,4 +80,11 @@ def check_indexes():
 
 
 if __name__ == "__main__":
-    check_indexes()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Check fingerprints index status")
+    parser.add_argument("--exact", action="store_true",
+                        help="Count fingerprints exactly with COUNT(*) (slow on large tables)")
+    args = parser.parse_args()
+    
+    check_indexes(exact=args.exact)
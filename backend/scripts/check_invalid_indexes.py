@@ -10,89 +10,45 @@ script_dir = Path(__file__).parent
 backend_dir = script_dir.parent
 sys.path.insert(0, str(backend_dir))
 
-from app.database import DatabaseManager
-from sqlalchemy import text
+from app.database import get_db
+from _index_inspect import prepare_session, list_indexes, index_usage, locks, column_stats
 
 
 def check_invalid_indexes():
     """Check for invalid or in-progress indexes."""
-    db = DatabaseManager()
+    db = get_db()
     session = db.get_session()
     
     try:
-        print("Checking for invalid indexes...")
+        prepare_session(session)
         
-        # Check for invalid indexes
-        result = session.execute(text("""
-            SELECT 
-                schemaname,
-                tablename,
-                indexname,
-                indexdef
-            FROM pg_indexes
-            WHERE tablename = 'fingerprints'
-            AND schemaname = 'public';
-        """))
+        print("Checking for invalid indexes...")
         
-        all_indexes = result.fetchall()
+        all_indexes = list_indexes(session)
         print(f"\nAll indexes on fingerprints table: {len(all_indexes)}")
         for idx in all_indexes:
-            print(f"  - {idx[2]}")
+            print(f"  - {idx[0]}")
         
         # Check pg_stat_user_indexes for index validity
-        result = session.execute(text("""
-            SELECT 
-                indexrelname,
-                idx_scan,
-                idx_tup_read,
-                idx_tup_fetch
-            FROM pg_stat_user_indexes
-            WHERE relname = 'fingerprints';
-        """))
-        
-        stats = result.fetchall()
+        stats = index_usage(session)
         print(f"\nIndex statistics:")
         for stat in stats:
             print(f"  {stat[0]}: scans={stat[1]}, tuples_read={stat[2]}, tuples_fetch={stat[3]}")
         
         # Check for locks on the fingerprints table
-        result = session.execute(text("""
-            SELECT 
-                locktype,
-                relation::regclass,
-                mode,
-                granted,
-                pid
-            FROM pg_locks
-            WHERE relation = 'fingerprints'::regclass;
-        """))
-        
-        locks = result.fetchall()
-        if locks:
-            print(f"\nLocks on fingerprints table: {len(locks)}")
-            for lock in locks:
-                print(f"  Type: {lock[0]}, Mode: {lock[2]}, Granted: {lock[3]}, PID: {lock[4]}")
+        table_locks = locks(session)
+        if table_locks:
+            print(f"\nLocks on fingerprints table: {len(table_locks)}")
+            for lock in table_locks:
+                print(f"  Type: {lock[0]}, Mode: {lock[1]}, Granted: {lock[2]}, PID: {lock[3]}")
         else:
             print("\nNo locks on fingerprints table")
         
         # Check for any CREATE INDEX that might have failed
-        result = session.execute(text("""
-            SELECT 
-                schemaname,
-                tablename,
-                attname,
-                n_distinct,
-                correlation
-            FROM pg_stats
-            WHERE tablename = 'fingerprints'
-            AND schemaname = 'public'
-            ORDER BY attname;
-        """))
-        
-        stats = result.fetchall()
-        print(f"\nColumn statistics for fingerprints:")
+        stats = column_stats(session)
+        print(f"\nColumn statistics for fingerprints (indexed columns):")
         for stat in stats:
-            print(f"  {stat[2]}: n_distinct={stat[3]}, correlation={stat[4]}")
+            print(f"  {stat[0]}: n_distinct={stat[1]}, correlation={stat[2]}")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -5,28 +5,25 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.fingerprint import AudioFingerprinter
-from app.database import DatabaseManager
+from dataclasses import asdict
+
+# Plain config objects - reading them doesn't import librosa or build a fingerprinter
+from app.config import FINGERPRINT_CONFIG, MATCHING_CONFIG
 
 print("="*60)
 print("CURRENT MATCHING CONFIGURATION")
 print("="*60)
 
 # Check fingerprinter settings
-fp = AudioFingerprinter()
 print("\n1. Fingerprint Generation Settings:")
-print(f"   - fan_value: {fp.fan_value}")
-print(f"   - target_zone_width: {fp.target_zone_width}")
-print(f"   - target_zone_start: {fp.target_zone_start}")
-print(f"   - sample_rate: {fp.sample_rate}")
-print(f"   - hop_length: {fp.hop_length}")
-print(f"   - peak_neighborhood_size: {fp.peak_neighborhood_size}")
+for name, value in asdict(FINGERPRINT_CONFIG).items():
+    print(f"   - {name}: {value}")
 
 print("\n2. Database Matching Settings:")
-print(f"   - MAX_QUERY_FINGERPRINTS: 400")
-print(f"   - BATCH_SIZE: 100")
-print(f"   - MIN_MATCHING_FINGERPRINTS: 20")
-print(f"   - MIN_CONFIDENCE_PERCENTAGE: 20%")
+for name, value in asdict(MATCHING_CONFIG).items():
+    print(f"   - {name.upper()}: {value}")
+print(f"   - MIN_MATCHING_FINGERPRINTS: {MATCHING_CONFIG.min_matching_fingerprints}")
+print(f"   - MIN_CONFIDENCE_PERCENTAGE: {MATCHING_CONFIG.min_confidence_percentage:g}%")
 
 print("\n3. Verification:")
 print("   ✓ All batches processed (no early exit)")
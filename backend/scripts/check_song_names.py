@@ -10,23 +10,30 @@ script_dir = Path(__file__).parent
 backend_dir = script_dir.parent
 sys.path.insert(0, str(backend_dir))
 
-from app.database import DatabaseManager
+from app.database import get_db
+from sqlalchemy import text
 
 def main():
-    db = DatabaseManager()
+    db = get_db()
     session = db.get_session()
     
     try:
-        from app.models import Song
-        songs = session.query(Song).limit(50).all()
+        # Short read-only query: skip JIT compilation (it costs more than these queries
+        # run for) and fail fast instead of queueing behind a lock
+        session.execute(text("SET LOCAL jit = off; SET LOCAL statement_timeout = '5s'"))
+        
+        # Only the printed columns, as plain rows - no ORM objects to hydrate
+        songs = session.execute(
+            text("SELECT id, title, artist FROM songs ORDER BY id LIMIT 50")
+        ).fetchall()
         
         print(f"Found {len(songs)} songs (showing first 50)\n")
         print("=" * 80)
         
-        for song in songs:
-            print(f"ID: {song.id}")
-            print(f"Title: {song.title}")
-            print(f"Artist: {song.artist}")
+        for song_id, title, artist in songs:
+            print(f"ID: {song_id}")
+            print(f"Title: {title}")
+            print(f"Artist: {artist}")
             print("-" * 80)
             
     finally:
@@ -19,40 +19,78 @@ script_dir = Path(__file__).parent
 backend_dir = script_dir.parent
 sys.path.insert(0, str(backend_dir))
 
-from app.database import DatabaseManager
+from app.database import get_db
 from app.models import Song
 
 
+# Compiled once at import; the cleaning functions run once per song
+_WS_RE = re.compile(r'\s+')
+
+# Common YouTube video suffixes
+_SUFFIX_PATTERNS = (
+    r'\s*[-|]\s*Official\s*(Music\s*)?Video.*$',
+    r'\s*[-|]\s*Official\s*Audio.*$',
+    r'\s*[-|]\s*Lyric(al)?\s*Video.*$',
+    r'\s*[-|]\s*Official\s*Lyric(al)?.*$',
+    r'\s*\(Official\s*(Music\s*)?Video\).*$',
+    r'\s*\(Official\s*Audio\).*$',
+    r'\s*\(Lyric(al)?\s*Video\).*$',
+    r'\s*\[Official.*\].*$',
+    r'\s*[-|]\s*Full\s*Video.*$',
+    r'\s*[-|]\s*Full\s*Song.*$',
+    r'\s*\(Full\s*Video\).*$',
+    r'\s*\(Full\s*Song\).*$',
+    r'\s*[-|]\s*4K.*$',
+    r'\s*[-|]\s*HD.*$',
+)
+# Every suffix pattern runs to end-of-string, so one alternation cuts at the
+# leftmost suffix in a single scan instead of 14 separate passes
+_SUFFIX_RE = re.compile('|'.join(f'(?:{p})' for p in _SUFFIX_PATTERNS), re.IGNORECASE)
+
+# Featured-artist markers, in the priority the old per-pattern loop tried them
+# ("ft"/"feat" cover their dotless forms). One scan finds every candidate; the
+# lookahead leaves the trailing space unconsumed so adjacent markers aren't skipped.
+_FEAT_RE = re.compile(
+    r'\s+(?:(?P<ft>ft\.?)|(?P<feat>feat\.?)|(?P<featuring>featuring))(?=\s.)',
+    re.IGNORECASE
+)
+_FEAT_PRIORITY = ('ft', 'feat', 'featuring')
+
+# Every suffix pattern contains one of these words, every feat pattern contains
+# "ft" or "feat": titles without them can skip the regex passes entirely
+_SUFFIX_MARKERS = ('official', 'lyric', 'full', '4k', 'hd')
+_FEAT_MARKERS = ('ft', 'feat')
+
+
+def _has_marker(text, markers):
+    """
+    Cheap substring prefilter: could a pattern built on these markers match text?
+    
+    Exact for ASCII text. Anything else goes to the regex, since re.IGNORECASE also
+    folds some non-ASCII letters onto the markers ('İ' and 'ı' to 'i', Kelvin sign, 'ſ').
+    """
+    if not text.isascii():
+        return True
+    low = text.lower()
+    return any(m in low for m in markers)
+
+
+def _needs_regex(text):
+    """Cheap substring prefilter: can any suffix or feat pattern match text?"""
+    return _has_marker(text, _SUFFIX_MARKERS) or _has_marker(text, _FEAT_MARKERS)
+
 def clean_text(text):
     """Basic text cleaning: underscores to spaces, strip extra spaces."""
     text = text.replace('_', ' ')
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     return text.strip()
 
 
 def remove_common_suffixes(text):
     """Remove common YouTube video suffixes."""
-    suffixes = [
-        r'\s*[-|]\s*Official\s*(Music\s*)?Video.*$',
-        r'\s*[-|]\s*Official\s*Audio.*$',
-        r'\s*[-|]\s*Lyric(al)?\s*Video.*$',
-        r'\s*[-|]\s*Official\s*Lyric(al)?.*$',
-        r'\s*\(Official\s*(Music\s*)?Video\).*$',
-        r'\s*\(Official\s*Audio\).*$',
-        r'\s*\(Lyric(al)?\s*Video\).*$',
-        r'\s*\[Official.*\].*$',
-        r'\s*[-|]\s*Full\s*Video.*$',
-        r'\s*[-|]\s*Full\s*Song.*$',
-        r'\s*\(Full\s*Video\).*$',
-        r'\s*\(Full\s*Song\).*$',
-        r'\s*[-|]\s*4K.*$',
-        r'\s*[-|]\s*HD.*$',
-    ]
-    
-    for pattern in suffixes:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-    
-    return text.strip()
+    if not _has_marker(text, _SUFFIX_MARKERS):
+        return text.strip()
+    return _SUFFIX_RE.sub('', text).strip()
 
 
 def extract_featured_artists(text):
@@ -60,21 +98,19 @@ def extract_featured_artists(text):
     Extract featured artists from text like "Song ft. Artist1, Artist2".
     Returns (main_text, featured_artists)
     """
-    # Patterns for featured artists
-    patterns = [
-        r'\s+ft\.?\s+(.+)$',
-        r'\s+feat\.?\s+(.+)$',
-        r'\s+featuring\s+(.+)$',
-        r'\s+ft\s+(.+)$',
-        r'\s+feat\s+(.+)$',
-    ]
+    if not _has_marker(text, _FEAT_MARKERS):
+        return text, None
     
-    for pattern in patterns:
-        match = re.search(pattern, text, flags=re.IGNORECASE)
-        if match:
-            featured = match.group(1).strip()
-            main_text = text[:match.start()].strip()
-            return main_text, featured
+    best_rank, best = len(_FEAT_PRIORITY), None
+    for match in _FEAT_RE.finditer(text):
+        rank = _FEAT_PRIORITY.index(match.lastgroup)
+        if rank < best_rank:
+            best_rank, best = rank, match
+            if rank == 0:
+                break
+    
+    if best:
+        return text[:best.start()].strip(), text[best.end():].strip()
     
     return text, None
 
@@ -112,8 +148,8 @@ def parse_youtube_title(raw_text):
     
     first_part, second_part = parts[0], parts[1]
     
-    # Remove common suffixes from second part
-    second_part = remove_common_suffixes(second_part)
+    # No second remove_common_suffixes pass: every suffix pattern ends in .*$, so
+    # the cut above already removed any match second_part (a tail of text) could hold
     
     # Check for featured artists in second part
     second_part, featured = extract_featured_artists(second_part)
@@ -163,21 +199,25 @@ def parse_youtube_title(raw_text):
 
 def preview_changes(dry_run=True):
     """Preview or apply song name cleaning."""
-    db = DatabaseManager()
+    db = get_db()
     session = db.get_session()
     
     try:
-        songs = session.query(Song).all()
-        
-        print(f"Processing {len(songs)} songs...")
+        print("Processing songs...")
         print("=" * 80)
         
         changes = []
+        processed = 0
+        parsed = 0
+        prefiltered = 0
+        
+        # Stream plain (id, title, artist) tuples in batches instead of loading every
+        # Song ORM object at once - constant memory, no identity-map bookkeeping
+        rows = session.query(Song.id, Song.title, Song.artist).yield_per(1000)
         
-        for song in songs:
+        for song_id, title_raw, artist_raw in rows:
+            processed += 1
             # Try parsing both title and artist to see which one has the messy YouTube text
-            title_raw = song.title
-            artist_raw = song.artist
             
             # Check if title or artist looks like a YouTube title (has underscores, long, etc)
             title_is_messy = '_' in title_raw or len(title_raw) > 50
@@ -193,6 +233,9 @@ def preview_changes(dry_run=True):
                 else:
                     source = title_raw
                 
+                parsed += 1
+                if not _needs_regex(source):
+                    prefiltered += 1
                 new_title, new_artist = parse_youtube_title(source)
             else:
                 # Both fields look clean, just clean them up slightly
@@ -202,7 +245,7 @@ def preview_changes(dry_run=True):
             # Check if changes are needed
             if new_title != title_raw or new_artist != artist_raw:
                 changes.append({
-                    'id': song.id,
+                    'id': song_id,
                     'old_title': title_raw,
                     'old_artist': artist_raw,
                     'new_title': new_title,
@@ -210,13 +253,18 @@ def preview_changes(dry_run=True):
                 })
         
         # Display changes
-        print(f"\nFound {len(changes)} songs that need cleaning:\n")
+        print(f"\nProcessed {processed} songs")
+        if parsed:
+            print(f"Prefilter skipped the regex passes for {prefiltered} of {parsed} parsed titles")
+        print(f"Found {len(changes)} songs that need cleaning:\n")
         
-        for change in changes[:50]:  # Show first 50
-            print(f"ID {change['id']}:")
-            print(f"  Old: \"{change['old_title']}\" by {change['old_artist']}")
-            print(f"  New: \"{change['new_title']}\" by {change['new_artist']}")
-            print()
+        # Show first 50, formatted up front and written in one go
+        sys.stdout.write(''.join(
+            f"ID {change['id']}:\n"
+            f"  Old: \"{change['old_title']}\" by {change['old_artist']}\n"
+            f"  New: \"{change['new_title']}\" by {change['new_artist']}\n\n"
+            for change in changes[:50]
+        ))
         
         if len(changes) > 50:
             print(f"... and {len(changes) - 50} more\n")
@@ -224,11 +272,11 @@ def preview_changes(dry_run=True):
         # Apply changes if not dry run
         if not dry_run:
             print("\nApplying changes...")
-            for change in changes:
-                song = session.query(Song).filter(Song.id == change['id']).first()
-                if song:
-                    song.title = change['new_title']
-                    song.artist = change['new_artist']
+            # Primary-key UPDATEs straight from dicts: no per-song SELECT, no change tracking
+            session.bulk_update_mappings(Song, [
+                {'id': change['id'], 'title': change['new_title'], 'artist': change['new_artist']}
+                for change in changes
+            ])
             
             session.commit()
             print(f"✓ Updated {len(changes)} songs in database!")
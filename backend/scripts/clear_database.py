@@ -11,9 +11,17 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from app.database import DatabaseManager
 from app.models import Base
+from sqlalchemy import text
 
-def clear_database():
-    """Drop all tables and recreate them (removes all data)."""
+def clear_database(recreate=False):
+    """
+    Remove all songs and fingerprints.
+    
+    Args:
+        recreate: Drop and recreate the tables (needed only after schema changes).
+            By default the tables are truncated, which keeps the indexes in place
+            (empty) instead of forcing a full index rebuild on the next ingest.
+    """
     
     db_manager = DatabaseManager()
     
@@ -21,15 +29,29 @@ def clear_database():
     print("WARNING: This will DELETE ALL songs and fingerprints!")
     print("=" * 60)
     
-    # Drop all tables
-    print("\n🗑️  Dropping all tables...")
-    Base.metadata.drop_all(bind=db_manager.engine)
-    print("✓ All tables dropped")
+    if recreate:
+        # Drop all tables
+        print("\n🗑️  Dropping all tables...")
+        Base.metadata.drop_all(bind=db_manager.engine)
+        print("✓ All tables dropped")
+        
+        # Recreate tables
+        print("\n🔨 Recreating tables...")
+        Base.metadata.create_all(bind=db_manager.engine)
+        print("✓ Tables recreated")
+    else:
+        print("\n🗑️  Truncating songs and fingerprints...")
+        with db_manager.engine.begin() as conn:
+            conn.execute(text("TRUNCATE TABLE fingerprints, songs RESTART IDENTITY CASCADE"))
+        print("✓ Tables truncated (indexes kept)")
     
-    # Recreate tables
-    print("\n🔨 Recreating tables...")
-    Base.metadata.create_all(bind=db_manager.engine)
-    print("✓ Tables recreated")
+    # Fresh planner stats for the now-empty tables, so the next ingest isn't planned
+    # against stale row counts. VACUUM can't run inside a transaction block.
+    print("\n📊 Running VACUUM ANALYZE...")
+    with db_manager.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.execute(text("VACUUM ANALYZE fingerprints"))
+        conn.execute(text("VACUUM ANALYZE songs"))
+    print("✓ Statistics refreshed")
     
     # Verify
     stats = db_manager.get_database_stats()
@@ -38,7 +60,17 @@ def clear_database():
     print("=" * 60)
     print(f"Total songs: {stats['total_songs']}")
     print(f"Total fingerprints: {stats['total_fingerprints']}")
+    print("\n💡 For a full reload, use the bulk paths (add_songs_parallel.py / reindex_databse.py):")
+    print("   they stream each song's fingerprints with a single COPY FROM STDIN instead")
+    print("   of inserting them row by row.")
     print()
 
 if __name__ == "__main__":
-    clear_database()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Clear all songs and fingerprints from the database")
+    parser.add_argument("--recreate", action="store_true",
+                        help="Drop and recreate the tables instead of truncating them (for schema changes)")
+    args = parser.parse_args()
+    
+    clear_database(recreate=args.recreate)
@@ -7,7 +7,12 @@ import sys
 import os
 import json
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
+try:
+    import orjson  # C-backed JSON; stdlib json is used when it isn't installed
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 script_dir = Path(__file__).parent
 backend_dir = script_dir.parent
@@ -18,6 +23,13 @@ from sqlalchemy import text
 
 SNAPSHOT_FILE = script_dir / "index_progress_snapshot.json"
 
+# (snapshot key, label) for the counters compared between runs
+PROGRESS_METRICS = (
+    ('tuples_done', 'tuples'),
+    ('blocks_done', 'blocks'),
+    ('partitions_done', 'partitions'),
+)
+
 
 def get_progress():
     """Get current progress metrics."""
@@ -36,18 +48,19 @@ def get_progress():
                 p.blocks_done,
                 p.partitions_total,
                 p.partitions_done,
-                now() - a.query_start AS duration
+                EXTRACT(EPOCH FROM now() - a.query_start) AS duration_seconds
             FROM pg_stat_progress_create_index p
-            JOIN pg_stat_activity a ON p.pid = a.pid;
+            JOIN pg_stat_activity a ON p.pid = a.pid
+            WHERE a.state = 'active'
+            LIMIT 1;
         """))
         
-        rows = result.fetchall()
+        # First active index creation
+        row = result.first()
         
-        if not rows:
+        if row is None:
             return None
         
-        # Return first active index creation
-        row = rows[0]
         return {
             "pid": row[0],
             "index_name": str(row[1]),
@@ -58,7 +71,8 @@ def get_progress():
             "blocks_done": row[6],
             "partitions_total": row[7],
             "partitions_done": row[8],
-            "duration": str(row[9]),
+            "duration_seconds": float(row[9] or 0),
+            "duration": str(timedelta(seconds=round(row[9] or 0))),
             "timestamp": datetime.now().isoformat()
         }
         
@@ -72,6 +86,8 @@ def get_progress():
 def load_previous():
     """Load previous snapshot."""
     if SNAPSHOT_FILE.exists():
+        if ORJSON_AVAILABLE:
+            return orjson.loads(SNAPSHOT_FILE.read_bytes())
         with open(SNAPSHOT_FILE, 'r') as f:
             return json.load(f)
     return None
@@ -79,6 +95,9 @@ def load_previous():
 
 def save_snapshot(data):
     """Save current snapshot."""
+    if ORJSON_AVAILABLE:
+        SNAPSHOT_FILE.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     with open(SNAPSHOT_FILE, 'w') as f:
         json.dump(data, f, indent=2)
 
@@ -107,38 +126,39 @@ def compare_progress():
         print("\n📊 PROGRESS COMPARISON:")
         print("-" * 70)
         
-        # Check tuples
-        if current['tuples_done'] is not None and previous['tuples_done'] is not None:
-            tuples_diff = current['tuples_done'] - previous['tuples_done']
-            print(f"Tuples processed: {current['tuples_done']:,} (was {previous['tuples_done']:,})")
-            if tuples_diff > 0:
-                print(f"  ✅ PROGRESSING: +{tuples_diff:,} tuples since last check")
-            else:
-                print(f"  ⚠️  STUCK: No tuples processed since last check")
+        # All counter diffs in one pass (only where both snapshots have a value)
+        diffs = {
+            key: current[key] - previous[key]
+            for key, _ in PROGRESS_METRICS
+            if current.get(key) is not None and previous.get(key) is not None
+        }
         
-        # Check blocks
-        if current['blocks_done'] is not None and previous['blocks_done'] is not None:
-            blocks_diff = current['blocks_done'] - previous['blocks_done']
-            print(f"\nBlocks processed: {current['blocks_done']:,} (was {previous['blocks_done']:,})")
-            if blocks_diff > 0:
-                print(f"  ✅ PROGRESSING: +{blocks_diff:,} blocks since last check")
-            else:
-                print(f"  ⚠️  STUCK: No blocks processed since last check")
+        # Time between checks
+        prev_time = datetime.fromisoformat(previous['timestamp'])
+        curr_time = datetime.fromisoformat(current['timestamp'])
+        time_diff = (curr_time - prev_time).total_seconds()
+        rates = {key: diff / time_diff for key, diff in diffs.items()} if time_diff > 0 else {}
         
-        # Check partitions
-        if current['partitions_done'] is not None and previous['partitions_done'] is not None:
-            parts_diff = current['partitions_done'] - previous['partitions_done']
-            if parts_diff > 0:
-                print(f"\nPartitions: +{parts_diff} since last check ✅")
+        for i, (key, label) in enumerate(PROGRESS_METRICS):
+            if key not in diffs:
+                continue
+            diff = diffs[key]
+            if key == 'partitions_done':
+                if diff > 0:
+                    print(f"\nPartitions: +{diff} since last check ✅")
+                continue
+            prefix = "\n" if i else ""
+            print(f"{prefix}{label.capitalize()} processed: {current[key]:,} (was {previous[key]:,})")
+            if diff > 0:
+                rate = f" ({rates[key]:,.0f} {label}/s)" if key in rates else ""
+                print(f"  ✅ PROGRESSING: +{diff:,} {label} since last check{rate}")
+            else:
+                print(f"  ⚠️  STUCK: No {label} processed since last check")
         
         # Check phase change
         if current['phase'] != previous['phase']:
             print(f"\n🔄 Phase changed: {previous['phase']} → {current['phase']}")
         
-        # Time between checks
-        prev_time = datetime.fromisoformat(previous['timestamp'])
-        curr_time = datetime.fromisoformat(current['timestamp'])
-        time_diff = (curr_time - prev_time).total_seconds()
         print(f"\n⏱️  Time between checks: {time_diff:.1f} seconds")
         
         # Overall verdict
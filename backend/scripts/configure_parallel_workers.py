@@ -10,13 +10,27 @@ script_dir = Path(__file__).parent
 backend_dir = script_dir.parent
 sys.path.insert(0, str(backend_dir))
 
-from app.database import DatabaseManager
+from app.database import get_db
 from sqlalchemy import text
 
 
+# Per-role overrides, applied with ALTER ROLE ... SET so they take effect on every
+# new connection made as that role.
+# - API (song matching): hash lookups are tiny index probes. Parallel workers
+#   only add launch cost, and parallel plans can regress catalog/metadata-heavy
+#   queries, so they are turned off.
+# - Ingest (bulk loads, COUNT/ANALYZE/CREATE INDEX): large scans that benefit
+#   from workers. Note that some drivers/cursor modes never launch the planned
+#   workers, so this is an upper bound rather than a guarantee.
+ROLE_SETTINGS = {
+    'shazam_api': {'max_parallel_workers_per_gather': '0'},
+    'shazam_ingest': {'max_parallel_workers_per_gather': '4'},
+}
+
+
 def check_current_settings():
     """Check current PostgreSQL parallel worker settings."""
-    db = DatabaseManager()
+    db = get_db()
     session = db.get_session()
     
     try:
@@ -34,9 +48,15 @@ def check_current_settings():
             ('min_parallel_index_scan_size', 'Min index size for parallel'),
         ]
         
+        # All settings in one round-trip; current_setting() formats values like SHOW
+        # does (with units), which raw pg_settings.setting would not
+        values = dict(session.execute(
+            text("SELECT name, current_setting(name) FROM unnest(CAST(:names AS text[])) AS name"),
+            {"names": [setting_name for setting_name, _ in settings]}
+        ).fetchall())
+        
         for setting_name, description in settings:
-            result = session.execute(text(f"SHOW {setting_name};"))
-            value = result.scalar()
+            value = values[setting_name]
             print(f"\n{description}:")
             print(f"  {setting_name} = {value}")
         
@@ -44,9 +64,10 @@ def check_current_settings():
         print("RECOMMENDATIONS FOR YOUR DATABASE")
         print("=" * 70)
         print("\n✅ Optimal settings for 418M+ fingerprints:")
-        print("   max_parallel_workers_per_gather = 4")
+        print("   max_parallel_workers_per_gather = 2")
         print("   max_worker_processes = 8")
         print("   max_parallel_workers = 8")
+        print("   parallel_setup_cost / parallel_tuple_cost: leave at defaults (1000 / 0.1)")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -58,7 +79,7 @@ def check_current_settings():
 
 def get_postgresql_conf_location():
     """Find PostgreSQL configuration file location."""
-    db = DatabaseManager()
+    db = get_db()
     session = db.get_session()
     
     try:
@@ -74,7 +95,7 @@ def get_postgresql_conf_location():
 
 def apply_settings_session():
     """Apply settings for current session only (temporary)."""
-    db = DatabaseManager()
+    db = get_db()
     session = db.get_session()
     
     try:
@@ -82,10 +103,13 @@ def apply_settings_session():
         print("APPLYING SETTINGS (SESSION ONLY - NOT PERMANENT)")
         print("=" * 70)
         
+        # Workers past 2 per gather give diminishing returns and starve concurrent
+        # match queries. Setup/tuple costs stay at their defaults: cheaper settings
+        # push short index lookups into parallel plans that cost more to launch
+        # than they save.
         commands = [
-            "SET max_parallel_workers_per_gather = 4;",
-            "SET parallel_setup_cost = 100;",
-            "SET parallel_tuple_cost = 0.001;",
+            "SET max_parallel_workers_per_gather = 2;",
+            "SET parallel_tuple_cost = 0.1;",
         ]
         
         for cmd in commands:
@@ -106,6 +130,46 @@ def apply_settings_session():
         session.close()
 
 
+def apply_role_settings():
+    """Persist the per-role parallel settings in ROLE_SETTINGS (roles that don't exist are skipped)."""
+    db = get_db()
+    session = db.get_session()
+    
+    try:
+        print("\n" + "=" * 70)
+        print("APPLYING PER-ROLE SETTINGS")
+        print("=" * 70)
+        
+        existing = {
+            row[0] for row in session.execute(
+                text("SELECT rolname FROM pg_roles WHERE rolname = ANY(:names)"),
+                {"names": list(ROLE_SETTINGS)}
+            )
+        }
+        
+        for role, settings in ROLE_SETTINGS.items():
+            if role not in existing:
+                print(f"\n⚠️  Role {role} does not exist - skipped")
+                continue
+            for setting_name, value in settings.items():
+                # Identifiers can't be bound parameters; both come from ROLE_SETTINGS above
+                cmd = f"ALTER ROLE {role} SET {setting_name} = {value};"
+                print(f"\n{cmd}")
+                session.execute(text(cmd))
+                print("  ✓ Applied")
+        
+        session.commit()
+        print("\n✅ Role settings saved (used by new connections for those roles)")
+        
+    except Exception as e:
+        session.rollback()
+        print(f"Error: {e}")
+        import traceback
+        traceback.print_exc()
+    finally:
+        session.close()
+
+
 def show_instructions():
     """Show instructions for permanent configuration."""
     config_file = get_postgresql_conf_location()
@@ -122,11 +186,10 @@ def show_instructions():
     
     print("\n2. Add/update these lines:")
     print("   " + "-" * 60)
-    print("   max_parallel_workers_per_gather = 4")
+    print("   max_parallel_workers_per_gather = 2")
     print("   max_worker_processes = 8")
     print("   max_parallel_workers = 8")
-    print("   parallel_setup_cost = 100")
-    print("   parallel_tuple_cost = 0.001")
+    print("   # leave parallel_setup_cost / parallel_tuple_cost at their defaults")
     print("   " + "-" * 60)
     
     print("\n3. Restart PostgreSQL service:")
@@ -144,15 +207,23 @@ if __name__ == "__main__":
     parser.add_argument("--check", action="store_true", help="Check current settings")
     parser.add_argument("--apply-session", action="store_true", help="Apply for current session (temporary)")
     parser.add_argument("--instructions", action="store_true", help="Show permanent configuration instructions")
+    parser.add_argument("--apply-roles", action="store_true",
+                        help="Persist per-role parallel settings (no parallel for the API role)")
     
     args = parser.parse_args()
     
-    if args.check or not any([args.apply_session, args.instructions]):
+    if args.check or not any([args.apply_session, args.instructions, args.apply_roles]):
         check_current_settings()
         print("\n💡 Run with --instructions to see how to configure permanently")
     
     if args.apply_session:
         apply_settings_session()
     
+    if args.apply_roles:
+        apply_role_settings()
+    
     if args.instructions:
         show_instructions()
+    
+    # Every helper above shared this one engine; close its pooled connections
+    get_db().engine.dispose()
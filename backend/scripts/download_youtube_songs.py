@@ -15,14 +15,35 @@ import json
 import os
 import subprocess
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+# Compiled once; clean_filename/parse_filename run per file during renames
+_INVALID_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+_WS_RE = re.compile(r'\s+')
+
+# (pattern, is "Title by Artist") in the order parse_filename tries them
+_PARSE_PATTERNS = (
+    (re.compile(r'^(.+?)\s*-\s*(.+)$'), False),  # Artist - Title
+    (re.compile(r'^(.+?)\s+by\s+(.+)$'), True),  # Title by Artist
+    (re.compile(r'^(.+?)_(.+)$'), False),          # Title_Artist
+)
+
+# Extensions picked up by rename_audio_files
+AUDIO_EXTENSIONS = frozenset({'mp3', 'wav', 'flac', 'm4a', 'ogg', 'opus', 'webm'})
+
+# yt-dlp's record of downloaded video IDs, kept inside each output directory
+ARCHIVE_FILENAME = '.yt-dlp-archive.txt'
+
+# Concurrent yt-dlp processes for batch downloads (network/transcode bound, not CPU)
+DEFAULT_WORKERS = 8
+
 def clean_filename(text):
     """Clean text for use in filenames."""
     # Remove invalid characters
-    text = re.sub(r'[<>:"/\\|?*]', '', text)
+    text = _INVALID_CHARS_RE.sub('', text)
     # Replace multiple spaces with single space
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     return text.strip()
 
 def parse_filename(filename):
@@ -38,18 +59,12 @@ def parse_filename(filename):
     name = Path(filename).stem  # Remove extension
     
     # Try different patterns
-    patterns = [
-        r'^(.+?)\s*-\s*(.+)$',      # Artist - Title
-        r'^(.+?)\s+by\s+(.+)$',     # Title by Artist
-        r'^(.+?)_(.+)$',            # Title_Artist
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, name)
+    for pattern, is_by in _PARSE_PATTERNS:
+        match = pattern.match(name)
         if match:
             part1, part2 = match.groups()
             # Heuristic: assume first part is artist if it's shorter or if pattern is "by"
-            if 'by' in pattern:
+            if is_by:
                 return part1.strip(), part2.strip()  # Title, Artist
             else:
                 return part2.strip(), part1.strip()  # Title, Artist
@@ -72,11 +87,14 @@ def rename_audio_files(directory, format_pattern="{title} by {artist}", dry_run=
         print(f"❌ Directory not found: {directory}")
         return
     
-    # Find audio files
-    audio_extensions = ['.mp3', '.wav', '.flac', '.m4a', '.ogg']
-    audio_files = []
-    for ext in audio_extensions:
-        audio_files.extend(dir_path.glob(f'*{ext}'))
+    # Find audio files: one directory pass instead of a glob per extension
+    with os.scandir(dir_path) as it:
+        names = sorted(
+            entry.name for entry in it
+            if entry.name.rpartition('.')[2].lower() in AUDIO_EXTENSIONS
+            and entry.is_file(follow_symlinks=False)
+        )
+    audio_files = [dir_path / name for name in names]
     
     if not audio_files:
         print(f"❌ No audio files found in {directory}")
@@ -90,7 +108,7 @@ def rename_audio_files(directory, format_pattern="{title} by {artist}", dry_run=
     skipped = 0
     errors = 0
     
-    for file_path in sorted(audio_files):
+    for file_path in audio_files:
         try:
             # Parse current filename
             title, artist = parse_filename(file_path.name)
@@ -143,28 +161,45 @@ def download_youtube_audio(query, output_dir='youtube_songs', max_results=1):
         output_dir: Directory to save audio files
         max_results: Number of results to download (usually 1)
     """
+    return download_youtube_target(f'ytsearch{max_results}:{query}', output_dir, max_results)
+
+def download_youtube_target(target, output_dir='youtube_songs', max_results=1):
+    """
+    Download audio for a yt-dlp target (a "ytsearchN:" query or a video URL).
+    
+    Safe to call from worker threads: all state lives in the yt-dlp subprocess.
+    """
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
     
     # yt-dlp command to search and download best audio
     cmd = [
         'yt-dlp',
-        f'ytsearch{max_results}:{query}',  # Search YouTube
+        target,                             # Search query or video URL
+        # YouTube's best audio is usually Opus in WebM. Extracting to opus only remuxes
+        # that stream into an Ogg container (no re-encode), and libsndfile reads Ogg
+        # Opus, so librosa loads it without falling back to an ffmpeg subprocess
+        '-f', 'bestaudio[acodec=opus]/bestaudio',
         '--extract-audio',                  # Extract audio only
-        '--audio-format', 'mp3',            # Convert to MP3
-        '--audio-quality', '0',             # Best quality
+        '--audio-format', 'opus',           # Ogg Opus (remux when the source is Opus)
         '--output', str(output_path / '%(artist)s - %(title)s.%(ext)s'),
         '--restrict-filenames',             # Clean filenames
         '--no-playlist',                    # Don't download playlists
         '--max-downloads', str(max_results),
+        # Already-downloaded video IDs are skipped by yt-dlp itself, before downloading
+        '--download-archive', str(output_path / ARCHIVE_FILENAME),
+        '--quiet',                          # Only errors (on stderr)
+        '--no-progress',
     ]
     
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        # Discard stdout and keep stderr as raw bytes, decoded only on failure, so each
+        # worker thread holds no download log in memory
+        result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=300)
         if result.returncode == 0:
             return True
         else:
-            print(f"   ✗ Error: {result.stderr[:100]}")
+            print(f"   ✗ Error: {result.stderr[:100].decode('utf-8', 'replace')}")
             return False
     except subprocess.TimeoutExpired:
         print(f"   ✗ Timeout")
@@ -173,8 +208,35 @@ def download_youtube_audio(query, output_dir='youtube_songs', max_results=1):
         print(f"   ✗ Failed: {e}")
         return False
 
-def download_from_playlist(playlist_url, output_dir='youtube_songs', max_songs=50):
-    """Download songs from a YouTube playlist."""
+def _download_parallel(targets, labels, output_dir, workers=DEFAULT_WORKERS):
+    """
+    Download yt-dlp targets on a thread pool, printing each result as it finishes.
+    
+    Returns:
+        (downloaded, failed) counts
+    """
+    downloaded = 0
+    failed = 0
+    total = len(targets)
+    
+    with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as ex:
+        futures = {
+            ex.submit(download_youtube_target, target, output_dir): label
+            for target, label in zip(targets, labels)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            label = futures[future]
+            if future.result():
+                downloaded += 1
+                print(f"[{done}/{total}] ✓ {label[:60]}")
+            else:
+                failed += 1
+                print(f"[{done}/{total}] ✗ {label[:60]}")
+    
+    return downloaded, failed
+
+def download_from_playlist(playlist_url, output_dir='youtube_songs', max_songs=50, workers=DEFAULT_WORKERS):
+    """Download songs from a YouTube playlist, several at a time."""
     output_path = Path(output_dir)
     output_path.mkdir(exist_ok=True)
     
@@ -183,25 +245,35 @@ def download_from_playlist(playlist_url, output_dir='youtube_songs', max_songs=5
     print(f"   Max songs: {max_songs}")
     print("=" * 60)
     
+    # List the entries first (metadata only, no downloads) so they can be fetched in parallel
     cmd = [
         'yt-dlp',
         playlist_url,
-        '--extract-audio',
-        '--audio-format', 'mp3',
-        '--audio-quality', '0',
-        '--output', str(output_path / '%(artist)s - %(title)s.%(ext)s'),
-        '--restrict-filenames',
-        '--max-downloads', str(max_songs),
+        '--flat-playlist',
+        '--dump-json',
+        '--playlist-end', str(max_songs),
         '--no-warnings',
     ]
     
     try:
-        subprocess.run(cmd, check=True)
-        print("\n✅ Playlist download complete!")
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        entries = [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
     except Exception as e:
         print(f"\n✗ Error: {e}")
+        return
+    
+    urls = [
+        entry.get('url') or f"https://www.youtube.com/watch?v={entry['id']}"
+        for entry in entries[:max_songs]
+    ]
+    labels = [entry.get('title') or url for entry, url in zip(entries, urls)]
+    
+    downloaded, failed = _download_parallel(urls, labels, output_dir, workers)
+    
+    print(f"\n✅ Playlist download complete! ({downloaded} downloaded, {failed} failed)")
 
-def download_from_json(json_file='music_songs_list.json', output_dir='youtube_songs', limit=50):
+def download_from_json(json_file='music_songs_list.json', output_dir='youtube_songs', limit=50,
+                       workers=DEFAULT_WORKERS):
     """
     Download songs from the JSON chart file using YouTube.
     
@@ -220,12 +292,9 @@ def download_from_json(json_file='music_songs_list.json', output_dir='youtube_so
     print(f"\n📥 Downloading songs from {json_file} via YouTube")
     print(f"   Output: {output_path.absolute()}")
     print(f"   Limit: {limit} songs")
+    print(f"   Workers: {workers}")
     print("=" * 60)
     
-    downloaded = 0
-    failed = 0
-    skipped = 0
-    
     # Flatten all tracks
     all_tracks = []
     for playlist_name, tracks in all_songs.items():
@@ -236,33 +305,19 @@ def download_from_json(json_file='music_songs_list.json', output_dir='youtube_so
     # Limit total downloads
     all_tracks = all_tracks[:limit]
     
-    for idx, track in enumerate(all_tracks, 1):
-        title = track['title']
-        artist = track['artist']
-        query = f"{artist} - {title}"
-        
-        # Clean filename for checking
-        safe_filename = f"{artist} - {title}".replace('/', '-').replace('\\', '-')
-        safe_filename = safe_filename.replace(':', '-').replace('?', '').replace('*', '')
-        
-        # Check if file already exists (rough check)
-        existing_files = list(output_path.glob(f"*{title[:20]}*.mp3"))
-        if existing_files:
-            print(f"[{idx}/{len(all_tracks)}] ⏭️  {query[:60]}... (exists)")
-            skipped += 1
-            continue
-        
-        print(f"[{idx}/{len(all_tracks)}] 📥 {query[:60]}...")
-        
-        if download_youtube_audio(query, output_dir):
-            downloaded += 1
-        else:
-            failed += 1
+    # Songs fetched on earlier runs are skipped by yt-dlp via the download archive,
+    # so the per-track work is just building the search query
+    queries = [f"{track['artist']} - {track['title']}" for track in all_tracks]
+    
+    # Downloads overlap on network I/O instead of running one yt-dlp at a time
+    print(f"\n📥 Downloading {len(queries)} songs...")
+    downloaded, failed = _download_parallel(
+        [f'ytsearch1:{query}' for query in queries], queries, output_dir, workers
+    )
     
     print("\n" + "=" * 60)
     print("✅ Download complete!")
-    print(f"   Downloaded: {downloaded}")
-    print(f"   Skipped (exists): {skipped}")
+    print(f"   Downloaded (or already in {ARCHIVE_FILENAME}): {downloaded}")
     print(f"   Failed: {failed}")
     print(f"\n📁 Audio files: {output_path.absolute()}")
     print(f"\n💡 Next step: Upload to database")
@@ -297,13 +352,20 @@ if __name__ == "__main__":
         print("  Mac: brew install yt-dlp")
         sys.exit(1)
     
+    # Optional "--workers N" anywhere on the command line (json and playlist commands)
+    workers = DEFAULT_WORKERS
+    if '--workers' in sys.argv:
+        i = sys.argv.index('--workers')
+        workers = int(sys.argv[i + 1])
+        del sys.argv[i:i + 2]
+    
     if len(sys.argv) > 1:
         command = sys.argv[1]
         
         if command == 'json':
             # Download from JSON chart file
             limit = int(sys.argv[2]) if len(sys.argv) > 2 else 50
-            download_from_json(limit=limit)
+            download_from_json(limit=limit, workers=workers)
         
         elif command == 'playlist':
             # Download from YouTube playlist
@@ -312,7 +374,7 @@ if __name__ == "__main__":
                 sys.exit(1)
             url = sys.argv[2]
             max_songs = int(sys.argv[3]) if len(sys.argv) > 3 else 50
-            download_from_playlist(url, max_songs=max_songs)
+            download_from_playlist(url, max_songs=max_songs, workers=workers)
         
         elif command == 'search':
             # Search and download single song
@@ -342,6 +404,7 @@ if __name__ == "__main__":
             print("  python download_youtube_songs.py playlist <URL> [max]   - Download from YouTube playlist")
             print("  python download_youtube_songs.py search '<query>'       - Search and download one song")
             print("  python download_youtube_songs.py rename <dir> [--execute] - Rename files to 'Title by Artist'")
+            print("\n  json/playlist accept --workers N (parallel downloads, default 8)")
     
     else:
         # Interactive mode
@@ -5,6 +5,8 @@ Many songs have artist in title field and song name in artist field due to YouTu
 
 import sys
 import os
+import re
+import functools
 from pathlib import Path
 
 script_dir = Path(__file__).parent
@@ -13,16 +15,80 @@ sys.path.insert(0, str(backend_dir))
 
 from app.database import DatabaseManager
 from app.models import Song
+from sqlalchemy import update, or_
 
 
+# Rows per executemany UPDATE batch
+UPDATE_BATCH_SIZE = 1000
+
+# Memoized titles/names per helper; artists and title fragments repeat across a library
+PARSE_CACHE_SIZE = 8192
+
+# Compiled once at import; the parsing helpers run once per song
+_WS_RE = re.compile(r'\s+')
+_LEAD_NUM_RE = re.compile(r'^\d+\.\s*')
+_FEAT_RE = re.compile(r'\s+(ft\.?|feat\.?|featuring)\s+(.+)', re.IGNORECASE)
+
+# PostgreSQL regexes for rows fix_database could change. A title is a candidate
+# if it has underscores, commas, 3+ words (swap checks) or whitespace clean_text
+# would collapse/strip; an artist only for the cleaning part.
+# PostgreSQL's \s is ASCII-only, unlike Python's, so any character outside
+# printable ASCII (NBSP, EM SPACE, \x1c...) is a candidate too - the same rows
+# clean_text's isprintable() shortcut sends down the full path.
+_DIRTY_WS_SQL = r'\s\s|^\s|\s$|[\t\n\r\f\v]|[^ -~]'
+_TITLE_CANDIDATE_SQL = r'[_,]|\S\s+\S+\s+\S|' + _DIRTY_WS_SQL
+_ARTIST_CANDIDATE_SQL = r'_|' + _DIRTY_WS_SQL
+
+# Common YouTube suffixes
+_SUFFIX_PATTERNS = (
+    r'\s*-?\s*Official\s+(Music\s+)?Video.*$',
+    r'\s*-?\s*Official\s+Audio.*$',
+    r'\s*-?\s*Lyric(al)?\s+Video.*$',
+    r'\s*\(Official.*\).*$',
+    r'\s*\[Official.*\].*$',
+    r'\s*-?\s*Full\s+Video.*$',
+    r'\s*-?\s*Full\s+Song.*$',
+    r'\s*-?\s*4K.*$',
+    r'\s*-?\s*HD.*$',
+    r'\s*-?\s*New\s+Song.*$',
+    r'\s*-?\s*Latest\s+Song.*$',
+    r'\s*\d{4}.*$',  # Remove years at the end
+)
+# Every pattern runs to end-of-string, so one alternation cuts at the leftmost
+# suffix in a single scan instead of 12 separate passes
+_SUFFIX_RE = re.compile('|'.join(f'(?:{p})' for p in _SUFFIX_PATTERNS), re.IGNORECASE)
+
+# Lowercase substrings at least one of which every suffix match contains (besides a year)
+_SUFFIX_MARKERS = ('official', 'lyric', 'full', '4k', 'hd', 'new', 'latest')
+_ASCII_DIGITS = '0123456789'
+
+
+def _may_have_suffix(text):
+    """
+    Cheap prefilter for _SUFFIX_RE using substring tests.
+    
+    Exact for ASCII text. Anything else goes to the regex, since IGNORECASE and digit
+    matching also cover some non-ASCII characters (Kelvin sign, other scripts' digits).
+    """
+    if not text.isascii():
+        return True
+    low = text.lower()
+    return any(m in low for m in _SUFFIX_MARKERS) or any(d in text for d in _ASCII_DIGITS)
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
 def clean_text(text):
     """Clean underscores and extra spaces."""
     text = text.replace('_', ' ')
-    import re
-    text = re.sub(r'\s+', ' ', text)
+    # Most titles have no runs of whitespace: skip the regex for those.
+    # isprintable() is False for tabs, newlines and non-ASCII spaces, which \s+ also folds
+    if '  ' not in text and text.isprintable():
+        return text.strip()
+    text = _WS_RE.sub(' ', text)
     return text.strip()
 
 
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
 def parse_youtube_title(title):
     """
     Parse YouTube-style title to extract song name and artist.
@@ -32,43 +98,26 @@ def parse_youtube_title(title):
     - "Artist feat. Artist2 - Song Name" -> ("Song Name", "Artist, Artist2")
     - "Song Name Official Video" -> ("Song Name", "Unknown")
     """
-    import re
-    
     # Clean first
     text = clean_text(title)
     
     # Remove common YouTube suffixes
-    patterns_to_remove = [
-        r'\s*-?\s*Official\s+(Music\s+)?Video.*$',
-        r'\s*-?\s*Official\s+Audio.*$',
-        r'\s*-?\s*Lyric(al)?\s+Video.*$',
-        r'\s*\(Official.*\).*$',
-        r'\s*\[Official.*\].*$',
-        r'\s*-?\s*Full\s+Video.*$',
-        r'\s*-?\s*Full\s+Song.*$',
-        r'\s*-?\s*4K.*$',
-        r'\s*-?\s*HD.*$',
-        r'\s*-?\s*New\s+Song.*$',
-        r'\s*-?\s*Latest\s+Song.*$',
-        r'\s*\d{4}.*$',  # Remove years at the end
-    ]
-    
-    for pattern in patterns_to_remove:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    if _may_have_suffix(text):
+        text = _SUFFIX_RE.sub('', text)
     
     text = text.strip()
     
     # Remove leading numbers and dots (like "03. " or "1. ")
-    text = re.sub(r'^\d+\.\s*', '', text)
+    text = _LEAD_NUM_RE.sub('', text)
     
     # Try to split by " - " (most common pattern)
-    if ' - ' in text:
-        parts = text.split(' - ', 1)
-        first_part = parts[0].strip()
-        second_part = parts[1].strip() if len(parts) > 1 else ""
+    first_part, sep, second_part = text.partition(' - ')
+    if sep:
+        first_part = first_part.strip()
+        second_part = second_part.strip()
         
         # Check for featured artists in first part
-        feat_match = re.search(r'\s+(ft\.?|feat\.?|featuring)\s+(.+)', first_part, re.IGNORECASE)
+        feat_match = _FEAT_RE.search(first_part)
         if feat_match:
             main_artist = first_part[:feat_match.start()].strip()
             featured = feat_match.group(2).strip()
@@ -94,20 +143,28 @@ def fix_database(dry_run=True):
     session = db.get_session()
     
     try:
-        songs = session.query(Song).all()
-        
-        print(f"Analyzing {len(songs)} songs...")
+        print("Analyzing songs...")
         print("=" * 80)
         
         changes = []
+        analyzed = 0
         
-        for song in songs:
-            title_raw = song.title
-            artist_raw = song.artist
-            
-            # Skip songs that are already clean (first 11 IDs)
-            if song.id <= 11:
-                continue
+        # Stream plain (id, title, artist) tuples in batches instead of loading every
+        # Song ORM object at once - constant memory, no identity-map bookkeeping.
+        # Rows that can't change are filtered out by PostgreSQL and never sent over.
+        rows = (
+            session.query(Song.id, Song.title, Song.artist)
+            .filter(Song.id > 11)  # First 11 IDs are already clean
+            .filter(or_(
+                Song.artist.in_(["NA", "Unknown"]),
+                Song.title.op('~')(_TITLE_CANDIDATE_SQL),
+                Song.artist.op('~')(_ARTIST_CANDIDATE_SQL),
+            ))
+            .yield_per(1000)
+        )
+        
+        for song_id, title_raw, artist_raw in rows:
+            analyzed += 1
             
             # Special handling for "NA" artist - parse the YouTube title
             if artist_raw == "NA" or artist_raw == "Unknown":
@@ -149,7 +206,7 @@ def fix_database(dry_run=True):
             # Track changes
             if new_title != title_raw or new_artist != artist_raw:
                 changes.append({
-                    'id': song.id,
+                    'id': song_id,
                     'old_title': title_raw,
                     'old_artist': artist_raw,
                     'new_title': new_title,
@@ -158,7 +215,8 @@ def fix_database(dry_run=True):
                 })
         
         # Display changes
-        print(f"\nFound {len(changes)} songs that need fixing:\n")
+        print(f"\nAnalyzed {analyzed} candidate songs")
+        print(f"Found {len(changes)} songs that need fixing:\n")
         
         for change in changes[:100]:  # Show first 100
             swap_marker = "[SWAPPED]" if change['swapped'] else "[CLEANED]"
@@ -177,15 +235,22 @@ def fix_database(dry_run=True):
         print(f"  Swapped (title <-> artist): {swapped}")
         print(f"  Cleaned (underscores):      {cleaned}")
         print(f"  Total changes:              {len(changes)}")
+        for helper in (clean_text, parse_youtube_title):
+            info = helper.cache_info()
+            lookups = info.hits + info.misses
+            if lookups:
+                print(f"  {helper.__name__} cache hits:  {info.hits}/{lookups} ({info.hits / lookups:.0%})")
         
         # Apply changes if not dry run
         if not dry_run:
             print("\nApplying changes...")
-            for change in changes:
-                song = session.query(Song).filter(Song.id == change['id']).first()
-                if song:
-                    song.title = change['new_title']
-                    song.artist = change['new_artist']
+            # ORM bulk UPDATE by primary key: executemany per batch, no per-song SELECT
+            rows = [
+                {'id': change['id'], 'title': change['new_title'], 'artist': change['new_artist']}
+                for change in changes
+            ]
+            for start in range(0, len(rows), UPDATE_BATCH_SIZE):
+                session.execute(update(Song), rows[start:start + UPDATE_BATCH_SIZE])
             
             session.commit()
             print(f"✓ Updated {len(changes)} songs in database!")
@@ -16,34 +16,30 @@ from sqlalchemy import text
 
 def kill_rebuild():
     db = DatabaseManager()
-    session = db.get_session()
     
+    # AUTOCOMMIT: pg_terminate_backend takes effect immediately, nothing to commit per PID
     try:
-        # Find the hanging query
-        result = session.execute(text("""
-            SELECT pid, query
-            FROM pg_stat_activity
-            WHERE query LIKE '%SELECT COUNT%FROM fingerprints%'
-            AND state = 'active'
-            AND pid != pg_backend_pid();
-        """))
-        
-        pids = result.fetchall()
-        
-        if pids:
-            for pid_row in pids:
-                pid = pid_row[0]
-                print(f"Terminating PID {pid}: {pid_row[1][:80]}")
-                session.execute(text(f"SELECT pg_terminate_backend({pid});"))
-                session.commit()
-                print(f"✓ Killed PID {pid}")
-        else:
-            print("No hanging queries found")
+        with db.engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            # Find the hanging query
+            pids = conn.execute(text("""
+                SELECT pid, query
+                FROM pg_stat_activity
+                WHERE query LIKE '%SELECT COUNT%FROM fingerprints%'
+                AND state = 'active'
+                AND pid != pg_backend_pid();
+            """)).fetchall()
+            
+            if pids:
+                terminate = text("SELECT pg_terminate_backend(:pid)")
+                for pid, query in pids:
+                    print(f"Terminating PID {pid}: {query[:80]}")
+                    conn.execute(terminate, {"pid": pid})
+                    print(f"✓ Killed PID {pid}")
+            else:
+                print("No hanging queries found")
             
     except Exception as e:
         print(f"Error: {e}")
-    finally:
-        session.close()
 
 
 if __name__ == "__main__":
@@ -16,6 +16,38 @@ from app.database import DatabaseManager
 from sqlalchemy import text
 
 
+# Seconds between polls while tuples_done is moving, and once it has stalled
+POLL_INTERVAL = 2
+IDLE_POLL_INTERVAL = 10
+# Unchanged polls before switching to IDLE_POLL_INTERVAL
+IDLE_POLLS_BEFORE_BACKOFF = 5
+
+# Progress bar halves, sliced per refresh instead of re-multiplied
+BAR_LENGTH = 40
+_BAR_FULL = "█" * BAR_LENGTH
+_BAR_EMPTY = "░" * BAR_LENGTH
+
+# Built once and reused for every poll
+PROGRESS_SQL = text("""
+    SELECT 
+        p.pid,
+        p.datname,
+        p.relid::regclass AS table_name,
+        p.index_relid::regclass AS index_name,
+        p.command,
+        p.phase,
+        p.tuples_total,
+        p.tuples_done,
+        p.partitions_total,
+        p.partitions_done,
+        now() - a.query_start AS duration
+    FROM pg_stat_progress_create_index p
+    JOIN pg_stat_activity a ON p.pid = a.pid
+    WHERE a.datname = current_database()
+      AND a.backend_type = 'client backend';
+""")
+
+
 def monitor_indexing():
     """Monitor index creation progress."""
     db = DatabaseManager()
@@ -24,31 +56,17 @@ def monitor_indexing():
     print("Press Ctrl+C to stop monitoring\n")
     
     last_progress = {}
+    last_key = None
+    unchanged_polls = 0
+    
+    # One connection for the whole watch instead of a new session per poll
+    conn = db.engine.connect()
     
     try:
         while True:
-            session = db.get_session()
             try:
                 # Check for active index creation
-                result = session.execute(text("""
-                    SELECT 
-                        p.pid,
-                        p.datname,
-                        p.relid::regclass AS table_name,
-                        p.index_relid::regclass AS index_name,
-                        p.command,
-                        p.phase,
-                        p.tuples_total,
-                        p.tuples_done,
-                        ROUND(100.0 * p.tuples_done / NULLIF(p.tuples_total, 0), 2) AS progress_pct,
-                        p.partitions_total,
-                        p.partitions_done,
-                        now() - a.query_start AS duration
-                    FROM pg_stat_progress_create_index p
-                    JOIN pg_stat_activity a ON p.pid = a.pid;
-                """))
-                
-                rows = result.fetchall()
+                rows = conn.execute(PROGRESS_SQL).fetchall()
                 
                 if rows:
                     for row in rows:
@@ -57,16 +75,15 @@ def monitor_indexing():
                         phase = row[5]
                         tuples_total = row[6]
                         tuples_done = row[7]
-                        progress_pct = row[8] or 0
-                        duration = row[11]
+                        progress_pct = 100.0 * tuples_done / tuples_total if tuples_total else 0.0
+                        duration = row[10]
                         
                         # Clear line and print progress
                         print(f"\r\033[K", end="")
                         
                         if tuples_total and tuples_total > 0:
-                            bar_length = 40
-                            filled = int(bar_length * tuples_done / tuples_total)
-                            bar = "█" * filled + "░" * (bar_length - filled)
+                            filled = int(BAR_LENGTH * tuples_done / tuples_total)
+                            bar = _BAR_FULL[:filled] + _BAR_EMPTY[filled:]
                             
                             print(f"[{bar}] {progress_pct:.1f}% | {index_name}", end="")
                             print(f" | Phase: {phase} | {tuples_done:,}/{tuples_total:,} tuples", end="")
@@ -83,15 +100,26 @@ def monitor_indexing():
                     else:
                         print("\r\033[KWaiting for index creation to start...", end="", flush=True)
                 
+                # Back off while nothing advances (waiting to start, or a long phase)
+                key = tuple((row[0], row[5], row[7]) for row in rows)
+                unchanged_polls = unchanged_polls + 1 if key == last_key else 0
+                last_key = key
+                
             except Exception as e:
                 print(f"\nError querying progress: {e}")
             finally:
-                session.close()
+                # End the transaction so the next poll sees fresh pg_stat_* values
+                conn.rollback()
             
-            time.sleep(2)  # Update every 2 seconds
+            if unchanged_polls >= IDLE_POLLS_BEFORE_BACKOFF:
+                time.sleep(IDLE_POLL_INTERVAL)
+            else:
+                time.sleep(POLL_INTERVAL)
             
     except KeyboardInterrupt:
         print("\n\nMonitoring stopped.")
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
@@ -7,6 +7,8 @@ WARNING: Database will be slow for queries while indexes are dropped!
 
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 script_dir = Path(__file__).parent
@@ -53,86 +55,100 @@ def drop_indexes():
         session.close()
 
 
-def rebuild_indexes():
-    """Rebuild indexes after bulk insert completes."""
-    db = DatabaseManager()
-    
-    # Use raw connection for CONCURRENTLY (cannot run in transaction)
+# (label, index name, column) rebuilt by rebuild_indexes
+INDEXES = [
+    ("hash", "idx_fingerprints_hash", "hash_value"),  # CRITICAL for song matching
+    ("time offset", "idx_fingerprints_time_offset", "time_offset"),
+    ("song_id", "idx_fingerprints_song_id", "song_id"),
+]
+
+
+def _build_index(db, name, column, concurrently):
+    """Create one index on its own AUTOCOMMIT connection."""
+    # Use raw connection so CONCURRENTLY can run (cannot run in transaction)
     connection = db.engine.raw_connection()
     connection.set_isolation_level(0)  # AUTOCOMMIT mode
     cursor = connection.cursor()
-    
     try:
-        print("\nRebuilding indexes (this may take 30+ minutes with large datasets)...")
-        print("  Starting index creation (fingerprint count check skipped for speed)...")
-        
-        # Rebuild hash index - CRITICAL for song matching
-        print("\n[1/3] Creating hash index... (this is the slowest)")
-        print("      This may take 15-30 minutes or more...")
-        try:
-            cursor.execute("""
-                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fingerprints_hash 
-                ON fingerprints(hash_value);
-            """)
-            print("      ✓ Hash index created successfully!")
-        except Exception as e:
-            print(f"      ✗ Failed to create hash index: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
-        
-        # Rebuild time offset index
-        print("\n[2/3] Creating time offset index...")
-        try:
-            cursor.execute("""
-                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fingerprints_time_offset 
-                ON fingerprints(time_offset);
-            """)
-            print("      ✓ Time offset index created successfully!")
-        except Exception as e:
-            print(f"      ✗ Failed to create time offset index: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
-        
-        # Rebuild song_id index
-        print("\n[3/3] Creating song_id index...")
-        try:
-            cursor.execute("""
-                CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fingerprints_song_id 
-                ON fingerprints(song_id);
-            """)
-            print("      ✓ Song_id index created successfully!")
-        except Exception as e:
-            print(f"      ✗ Failed to create song_id index: {e}")
-            import traceback
-            traceback.print_exc()
-            raise
-        
-        print("\n✓ All indexes rebuilt successfully!")
-        print("  Database is now optimized for queries")
-        
-    except Exception as e:
-        print(f"\n✗ Error rebuilding indexes: {e}")
-        raise
+        start = time.time()
+        cursor.execute(f"""
+            CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name}
+            ON fingerprints({column});
+        """)
+        return time.time() - start
     finally:
         cursor.close()
         connection.close()
 
 
+def rebuild_indexes(concurrently=False):
+    """
+    Rebuild indexes after bulk insert completes.
+    
+    By default all three indexes are built at the same time, each on its own
+    connection. Plain CREATE INDEX takes a SHARE lock, which the builds can hold
+    together, and PostgreSQL's synchronized sequential scans let them share one
+    pass over the heap. Writes to fingerprints are blocked until they finish.
+    
+    CREATE INDEX CONCURRENTLY keeps the table writable, but its lock conflicts with
+    itself, so with concurrently=True the builds run one after another as before.
+    """
+    db = DatabaseManager()
+    
+    print("\nRebuilding indexes (this may take 30+ minutes with large datasets)...")
+    print("  Starting index creation (fingerprint count check skipped for speed)...")
+    
+    if concurrently:
+        for i, (label, name, column) in enumerate(INDEXES, 1):
+            print(f"\n[{i}/{len(INDEXES)}] Creating {label} index CONCURRENTLY...")
+            try:
+                elapsed = _build_index(db, name, column, concurrently=True)
+                print(f"      ✓ {label} index created in {elapsed:.0f}s")
+            except Exception as e:
+                print(f"      ✗ Failed to create {label} index: {e}")
+                import traceback
+                traceback.print_exc()
+                raise
+    else:
+        print(f"\nCreating {len(INDEXES)} indexes in parallel (writes blocked until done)...")
+        failures = []
+        with ThreadPoolExecutor(max_workers=len(INDEXES)) as executor:
+            futures = {
+                executor.submit(_build_index, db, name, column, False): label
+                for label, name, column in INDEXES
+            }
+            for future in as_completed(futures):
+                label = futures[future]
+                try:
+                    print(f"      ✓ {label} index created in {future.result():.0f}s")
+                except Exception as e:
+                    print(f"      ✗ Failed to create {label} index: {e}")
+                    failures.append((label, e))
+        
+        if failures:
+            label, e = failures[0]
+            print(f"\n✗ Error rebuilding indexes: {len(failures)} failed")
+            raise e
+    
+    print("\n✓ All indexes rebuilt successfully!")
+    print("  Database is now optimized for queries")
+
+
 if __name__ == "__main__":
     import argparse
     
     parser = argparse.ArgumentParser(description="Optimize database for bulk operations")
     parser.add_argument("--drop", action="store_true", help="Drop indexes before bulk insert")
     parser.add_argument("--rebuild", action="store_true", help="Rebuild indexes after bulk insert")
+    parser.add_argument("--concurrently", action="store_true",
+                        help="With --rebuild: build one at a time with CONCURRENTLY so writes keep working")
     
     args = parser.parse_args()
     
     if args.drop:
         drop_indexes()
     elif args.rebuild:
-        rebuild_indexes()
+        rebuild_indexes(concurrently=args.concurrently)
     else:
         print("Usage:")
         print("  Before bulk insert:  python optimize_bulk_insert.py --drop")
@@ -66,24 +66,22 @@ def update_postgresql_performance():
     print(f"\n🔧 Updating performance settings...")
     
     for line in lines:
-        updated = False
+        # Setting name of this line (commented or not): the first token before '=' or whitespace
+        stripped = line.strip()
+        if stripped.startswith('#'):
+            stripped = stripped[1:].strip()
+        tokens = stripped.split('=', 1)[0].split()
+        setting_name = tokens[0] if tokens else None
         
-        for setting_name, new_value in settings.items():
-            # Check if this line contains the setting (commented or not)
-            stripped = line.strip()
-            if stripped.startswith('#'):
-                stripped = stripped[1:].strip()
-            
-            if stripped.startswith(setting_name):
-                found_settings.add(setting_name)
-                # Replace the line
-                new_line = f"{setting_name} = {new_value}\n"
-                new_lines.append(new_line)
-                print(f"  ✓ Updated: {setting_name} = {new_value}")
-                updated = True
-                break
-        
-        if not updated:
+        # Exact dict lookup instead of startswith() against every setting
+        if setting_name in settings:
+            new_value = settings[setting_name]
+            found_settings.add(setting_name)
+            # Replace the line
+            new_line = f"{setting_name} = {new_value}\n"
+            new_lines.append(new_line)
+            print(f"  ✓ Updated: {setting_name} = {new_value}")
+        else:
             new_lines.append(line)
     
     # Add any settings that weren't found
@@ -1,13 +1,18 @@
 import sys
 import os
 import argparse
+import io
+import queue
+import threading
+from contextlib import redirect_stdout
+from multiprocessing import Pool, cpu_count
 from pathlib import Path
 
 sys.path.append('..')
 
 from app.fingerprint import AudioFingerprinter
 from app.database import DatabaseManager
-from app.models import Base
+from app.models import Base, Song
 
 
 def parse_title_artist(filename: str):
@@ -30,11 +35,85 @@ def build_fingerprinter(args) -> AudioFingerprinter:
 	)
 
 
+AUDIO_EXTENSIONS = frozenset({"mp3", "wav", "flac", "ogg", "m4a", "opus", "webm"})
+
+
 def iter_audio_files(audio_dir: Path):
-	exts = {".mp3", ".wav", ".flac", ".ogg", ".m4a"}
-	for path in sorted(audio_dir.rglob("*")):
-		if path.suffix.lower() in exts:
-			yield path
+	# scandir's DirEntry carries the file type from readdir, so no stat per file;
+	# entries are sorted per directory to keep the ingest order stable
+	with os.scandir(audio_dir) as it:
+		entries = sorted(it, key=lambda entry: entry.name)
+	for entry in entries:
+		if entry.is_dir(follow_symlinks=False):
+			yield from iter_audio_files(Path(entry.path))
+		elif entry.name.rpartition(".")[2].lower() in AUDIO_EXTENSIONS:
+			yield Path(entry.path)
+
+
+# Files per buffered progress write
+PROGRESS_FLUSH_FILES = 100
+
+# Fingerprinted files allowed to wait for the database writer
+WRITE_QUEUE_SIZE = 4
+
+# Per-worker fingerprinter, set once by _init_worker when the pool starts
+_fingerprinter = None
+
+
+def _init_worker(fingerprinter):
+	global _fingerprinter
+	_fingerprinter = fingerprinter
+
+
+def _fingerprint_worker(audio_path: Path):
+	"""Fingerprint one file in a pool worker; returns (hashes, error)."""
+	try:
+		return _fingerprinter.fingerprint_file(str(audio_path)), None
+	except Exception as exc:
+		return None, exc
+
+
+def _insert_results(db, write_queue, total, out, log_buf):
+	"""Writer thread: add (audio_path, (hashes, error)) items to the database until None."""
+	idx = 0
+	while True:
+		item = write_queue.get()
+		if item is None:
+			return
+		audio_path, (hashes, error) = item
+		idx += 1
+		if idx % PROGRESS_FLUSH_FILES == 0:
+			out.write(log_buf.getvalue())
+			out.flush()
+			log_buf.seek(0)
+			log_buf.truncate()
+		print(f"[{idx}/{total}] {audio_path.name}")
+		if error is not None:
+			print(f"  ✗ Failed: {error}")
+			continue
+		try:
+			title, artist = parse_title_artist(audio_path.name)
+			song_id = db.add_song(
+				title=title,
+				artist=artist,
+				album=None,
+				duration=None,
+				fingerprints=hashes,
+				filepath=str(audio_path),
+			)
+			print(f"  ✓ Added as song ID {song_id} ({len(hashes)} fingerprints)")
+		except Exception as exc:
+			print(f"  ✗ Failed: {exc}")
+
+
+def _existing_file_hashes(db) -> set:
+	"""file_hash of every song already in the database (one query, no per-file lookups)."""
+	session = db.get_session()
+	try:
+		rows = session.query(Song.file_hash).filter(Song.file_hash.isnot(None))
+		return {file_hash for (file_hash,) in rows}
+	finally:
+		session.close()
 
 
 def reindex_database(args):
@@ -44,7 +123,10 @@ def reindex_database(args):
 	if not audio_dir.exists():
 		raise SystemExit(f"Audio directory not found: {audio_dir}")
 
-	print("This will DROP and recreate all tables, then fingerprint and upload every audio file found.")
+	if args.incremental:
+		print("This will fingerprint and upload every audio file not already in the database.")
+	else:
+		print("This will DROP and recreate all tables, then fingerprint and upload every audio file found.")
 	print(f"Database URL: {os.getenv('DATABASE_URL')}")
 	print(f"Audio directory: {audio_dir}")
 	if not args.force:
@@ -53,10 +135,13 @@ def reindex_database(args):
 			print("Cancelled.")
 			return
 
-	# Drop and recreate schema
-	Base.metadata.drop_all(bind=db.engine)
-	Base.metadata.create_all(bind=db.engine)
-	print("✓ Database schema recreated")
+	if args.incremental:
+		Base.metadata.create_all(bind=db.engine)
+	else:
+		# Drop and recreate schema
+		Base.metadata.drop_all(bind=db.engine)
+		Base.metadata.create_all(bind=db.engine)
+		print("✓ Database schema recreated")
 
 	fp = build_fingerprinter(args)
 
@@ -65,23 +150,47 @@ def reindex_database(args):
 		print("No audio files found to ingest.")
 		return
 
-	print(f"Found {len(audio_files)} audio files. Fingerprinting...")
-	for idx, audio_path in enumerate(audio_files, 1):
-		print(f"[{idx}/{len(audio_files)}] {audio_path.name}")
-		try:
-			hashes = fp.fingerprint_file(str(audio_path))
-			title, artist = parse_title_artist(audio_path.name)
-			song_id = db.add_song(
-				title=title,
-				artist=artist,
-				album=None,
-				duration=None,
-				fingerprints=hashes,
-				filepath=str(audio_path),
+	if args.incremental:
+		# Same SHA-256 add_song stores, so already-ingested files are skipped
+		# before they cost a fingerprinting pass
+		existing = _existing_file_hashes(db)
+		found = len(audio_files)
+		audio_files = [
+			path for path in audio_files
+			if db._generate_file_hash(str(path)) not in existing
+		]
+		print(f"Skipping {found - len(audio_files)} files already in the database.")
+		if not audio_files:
+			print("Nothing new to ingest.")
+			return
+
+	workers = args.workers or max(1, cpu_count() - 1)
+	print(f"Found {len(audio_files)} audio files. Fingerprinting with {workers} workers...")
+
+	# Workers do the CPU-bound fingerprinting; this thread only hands finished
+	# files to a writer thread over a bounded queue, and the writer runs the
+	# COPYs, so pool result handling never waits on the database.
+	# Per-file lines (including add_song's own) are collected in a buffer and
+	# written once every PROGRESS_FLUSH_FILES files instead of one terminal write per line.
+	out = sys.stdout
+	log_buf = io.StringIO()
+	try:
+		with Pool(processes=workers, initializer=_init_worker, initargs=(fp,)) as pool, redirect_stdout(log_buf):
+			write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+			writer = threading.Thread(
+				target=_insert_results, args=(db, write_queue, len(audio_files), out, log_buf)
 			)
-			print(f"  ✓ Added as song ID {song_id} ({len(hashes)} fingerprints)")
-		except Exception as exc:
-			print(f"  ✗ Failed: {exc}")
+			writer.start()
+			try:
+				results = pool.imap(_fingerprint_worker, audio_files, chunksize=4)
+				for item in zip(audio_files, results):
+					write_queue.put(item)
+			finally:
+				write_queue.put(None)
+				writer.join()
+	finally:
+		out.write(log_buf.getvalue())
+		out.flush()
 
 	print("Reindexing complete.")
 
@@ -97,6 +206,9 @@ def main():
 	parser.add_argument("--hop-length", type=int, default=512, help="STFT hop length")
 	parser.add_argument("--freq-min", type=int, default=20, help="Min frequency considered")
 	parser.add_argument("--freq-max", type=int, default=8000, help="Max frequency considered")
+	parser.add_argument("--workers", type=int, default=None, help="Fingerprinting processes (default: CPU count - 1)")
+	parser.add_argument("--incremental", action="store_true",
+		help="Keep existing data and only ingest files whose hash is not in the database")
 	parser.add_argument("--force", action="store_true", help="Skip confirmation prompt")
 
 	args = parser.parse_args()
@@ -5,58 +5,91 @@ Extracts artist and title from MP3 tags and renames files to: "Artist - Title.mp
 
 import sys
 import os
+import io
+from contextlib import redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
 
 # Set UTF-8 encoding for console output on Windows
+# (reconfigure keeps the native TextIOWrapper instead of a Python-level codecs writer)
 if sys.platform == 'win32':
-    import codecs
-    sys.stdout = codecs.getwriter('utf-8')(sys.stdout.buffer, 'ignore')
-    sys.stderr = codecs.getwriter('utf-8')(sys.stderr.buffer, 'ignore')
+    sys.stdout.reconfigure(encoding='utf-8', errors='ignore')
+    sys.stderr.reconfigure(encoding='utf-8', errors='ignore')
 
 # Try to import mutagen for metadata reading
 try:
-    from mutagen.mp3 import MP3
-    from mutagen.id3 import ID3
+    from mutagen.id3 import ID3, ID3NoHeaderError, TPE1, TPE2, TIT2, TP1, TP2, TT2
 except ImportError:
     print("Error: mutagen library not found. Install it with: pip install mutagen")
     sys.exit(1)
 
 
+# Terms to remove (case insensitive)
+_VIDEO_TERM_PATTERNS = (
+    r'\bofficial\s+video\b',
+    r'\bofficial\s+music\s+video\b',
+    r'\bfull\s+video\b',
+    r'\bfull\s+song\b',
+    r'\bfull\s+audio\b',
+    r'\bvideo\s+song\b',
+    r'\baudio\s+song\b',
+    r'\blyric\s+video\b',
+    r'\blyrical\s+video\b',
+    r'\blyrical\s+song\b',
+    r'\bbest\s+video\b',
+    r'\bbest\s+audio\b',
+    r'\bbest\s+song\b',
+    r'\bmusic\s+video\b',
+    r'\btitle\s+track\b',
+    r'\btitle\s+song\b',
+    r'\bwith\s+lyrics\b',
+    r'\bfeat\.\b',
+    r'\bfeaturing\b',
+    r'\bft\.\b',
+)
+# All terms fused into one alternation: a single scan of the title instead of 20
+_VIDEO_TERMS_RE = re.compile('|'.join(f'(?:{p})' for p in _VIDEO_TERM_PATTERNS), re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+
+# Files per buffered stdout write in rename_songs
+OUTPUT_FLUSH_FILES = 1000
+
+# Threads reading tags in parallel; the work is disk-bound, not CPU-bound
+METADATA_WORKERS = 8
+
+# The only ID3 frames get_metadata reads; everything else (cover art, lyrics) is left undecoded.
+# TP1/TP2/TT2 are the ID3v2.2 names; mutagen upgrades them to TPE1/TPE2/TIT2 on load.
+_METADATA_FRAMES = {
+    'TPE1': TPE1, 'TPE2': TPE2, 'TIT2': TIT2,
+    'TP1': TP1, 'TP2': TP2, 'TT2': TT2,
+}
+
+# Problematic filename characters -> replacement, applied with str.translate
+_FILENAME_TABLE = str.maketrans({
+    '/': '_',
+    '\\': '_',
+    ':': '_',
+    '*': '_',
+    '?': '_',
+    '"': '_',
+    '<': '_',
+    '>': '_',
+    '|': '_',
+    '\n': ' ',
+    '\r': ' ',
+})
+
+
 def remove_video_terms(text: str) -> str:
     """Remove common video/song-related terms from title."""
     if not text:
         return text
     
-    # Terms to remove (case insensitive)
-    terms_to_remove = [
-        r'\bofficial\s+video\b',
-        r'\bofficial\s+music\s+video\b',
-        r'\bfull\s+video\b',
-        r'\bfull\s+song\b',
-        r'\bfull\s+audio\b',
-        r'\bvideo\s+song\b',
-        r'\baudio\s+song\b',
-        r'\blyric\s+video\b',
-        r'\blyrical\s+video\b',
-        r'\blyrical\s+song\b',
-        r'\bbest\s+video\b',
-        r'\bbest\s+audio\b',
-        r'\bbest\s+song\b',
-        r'\bmusic\s+video\b',
-        r'\btitle\s+track\b',
-        r'\btitle\s+song\b',
-        r'\bwith\s+lyrics\b',
-        r'\bfeat\.\b',
-        r'\bfeaturing\b',
-        r'\bft\.\b',
-    ]
-    
-    for term in terms_to_remove:
-        text = re.sub(term, '', text, flags=re.IGNORECASE)
+    text = _VIDEO_TERMS_RE.sub('', text)
     
     # Remove multiple spaces and clean up
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     text = text.strip(' -_|')
     
     return text
@@ -67,26 +100,11 @@ def clean_filename(text: str) -> str:
     if not text:
         return "Unknown"
     
-    # Replace problematic characters
-    replacements = {
-        '/': '_',
-        '\\': '_',
-        ':': '_',
-        '*': '_',
-        '?': '_',
-        '"': '_',
-        '<': '_',
-        '>': '_',
-        '|': '_',
-        '\n': ' ',
-        '\r': ' ',
-    }
-    
-    for old, new in replacements.items():
-        text = text.replace(old, new)
+    # Replace problematic characters in one pass
+    text = text.translate(_FILENAME_TABLE)
     
     # Remove multiple spaces
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
     
     # Remove leading/trailing spaces and dots
     text = text.strip('. ')
@@ -94,32 +112,37 @@ def clean_filename(text: str) -> str:
     return text or "Unknown"
 
 
-def get_metadata(file_path: Path):
-    """Extract artist and title from MP3 metadata."""
+def get_metadata(file_path: str):
+    """
+    Extract artist and title from MP3 metadata.
+    
+    Returns (artist, title, error); error is a message when the tags couldn't be read.
+    Runs in worker threads, so it reports errors instead of printing them.
+    """
     try:
-        audio = MP3(file_path, ID3=ID3)
+        # Only the ID3 tag is parsed (no MPEG stream scan), and only the frames we use
+        tags = ID3(file_path, known_frames=_METADATA_FRAMES)
         
-        # Try to get artist
-        artist = None
-        if 'TPE1' in audio.tags:  # Lead artist
-            artist = str(audio.tags['TPE1'])
-        elif 'TPE2' in audio.tags:  # Album artist
-            artist = str(audio.tags['TPE2'])
+        # Try to get artist: lead artist, else album artist (one lookup per frame)
+        artist_frame = tags.get('TPE1')
+        if artist_frame is None:
+            artist_frame = tags.get('TPE2')
+        artist = str(artist_frame) if artist_frame is not None else None
         
         # Try to get title
-        title = None
-        if 'TIT2' in audio.tags:  # Title
-            title = str(audio.tags['TIT2'])
+        title_frame = tags.get('TIT2')
+        title = str(title_frame) if title_frame is not None else None
         
-        return artist, title
+        return artist, title, None
         
+    except ID3NoHeaderError:
+        return None, None, "no ID3 tag"
     except Exception as e:
-        print(f"  Error reading metadata: {e}")
-        return None, None
+        return None, None, str(e)
 
 
-def rename_songs(directory: str, dry_run: bool = False):
-    """Rename all audio files in directory based on metadata."""
+def rename_songs(directory: str, dry_run: bool = False, recursive: bool = False):
+    """Rename all audio files in directory (and its subdirectories if recursive) based on metadata."""
     
     directory = Path(directory).resolve()
     
@@ -130,8 +153,19 @@ def rename_songs(directory: str, dry_run: bool = False):
     # Supported audio extensions
     audio_extensions = {'.mp3', '.m4a', '.flac', '.wav', '.ogg'}
     
-    files = [f for f in directory.iterdir() 
-             if f.is_file() and f.suffix.lower() in audio_extensions]
+    if recursive:
+        # os.walk is scandir-based: one listing per directory, names stay plain strings
+        files = [os.path.join(root, name)
+                 for root, _dirs, names in os.walk(directory)
+                 for name in names
+                 if os.path.splitext(name)[1].lower() in audio_extensions]
+    else:
+        # scandir reuses the file type from the directory listing (no stat per entry);
+        # files are kept as the plain path strings it returns
+        with os.scandir(directory) as it:
+            files = [entry.path for entry in it
+                     if os.path.splitext(entry.name)[1].lower() in audio_extensions
+                     and entry.is_file()]
     
     if not files:
         print(f"No audio files found in: {directory}")
@@ -148,51 +182,73 @@ def rename_songs(directory: str, dry_run: bool = False):
     renamed_count = 0
     skipped_count = 0
     
-    for file_path in files:
-        print(f"Processing: {file_path.name}")
-        
-        # Get metadata
-        artist, title = get_metadata(file_path)
-        
-        if not artist or not title:
-            print(f"  ⚠ Skipped: Missing metadata (artist: {artist}, title: {title})")
-            skipped_count += 1
-            continue
-        
-        # Remove video terms from title
-        title = remove_video_terms(title)
-        
-        # Clean the metadata
-        artist_clean = clean_filename(artist)
-        title_clean = clean_filename(title)
-        
-        # Create new filename
-        new_name = f"{title_clean} - {artist_clean}{file_path.suffix}"
-        new_path = file_path.parent / new_name
-        
-        # Check if file already has the correct name
-        if file_path.name == new_name:
-            print(f"  ✓ Already correctly named")
-            continue
-        
-        # Check if target file already exists
-        if new_path.exists():
-            print(f"  ⚠ Skipped: Target file already exists: {new_name}")
-            skipped_count += 1
-            continue
-        
-        # Rename the file
-        if dry_run:
-            print(f"  → Would rename to: {new_name}")
-            renamed_count += 1
-        else:
-            try:
-                file_path.rename(new_path)
-                print(f"  ✓ Renamed to: {new_name}")
-                renamed_count += 1
-            except Exception as e:
-                print(f"  ✗ Error renaming: {e}")
-                skipped_count += 1
+    # Read tags on a thread pool (overlapping disk I/O); renames stay on this
+    # thread, in order, so target-exists checks are deterministic
+    with ThreadPoolExecutor(max_workers=METADATA_WORKERS) as executor:
+        metadata = list(executor.map(get_metadata, files))
+    
+    # Per-file lines go to a buffer written every OUTPUT_FLUSH_FILES files,
+    # instead of a console write (and flush) per print
+    out = sys.stdout
+    log_buf = io.StringIO()
+    try:
+        with redirect_stdout(log_buf):
+            for idx, (file_path, (artist, title, error)) in enumerate(zip(files, metadata), 1):
+                if idx % OUTPUT_FLUSH_FILES == 0:
+                    out.write(log_buf.getvalue())
+                    log_buf.seek(0)
+                    log_buf.truncate()
+                
+                # Split once with os.path; no Path objects rebuilt per file
+                parent, name = os.path.split(file_path)
+                suffix = os.path.splitext(name)[1]
+                print(f"Processing: {name}")
+                
+                if error:
+                    print(f"  Error reading metadata: {error}")
+                
+                if not artist or not title:
+                    print(f"  ⚠ Skipped: Missing metadata (artist: {artist}, title: {title})")
+                    skipped_count += 1
+                    continue
+                
+                # Remove video terms from title
+                title = remove_video_terms(title)
+                
+                # Clean the metadata
+                artist_clean = clean_filename(artist)
+                title_clean = clean_filename(title)
+                
+                # Create new filename
+                new_name = f"{title_clean} - {artist_clean}{suffix}"
+                new_path = os.path.join(parent, new_name)
+                
+                # Check if file already has the correct name
+                if name == new_name:
+                    print(f"  ✓ Already correctly named")
+                    continue
+                
+                # Check if target file already exists
+                if os.path.exists(new_path):
+                    print(f"  ⚠ Skipped: Target file already exists: {new_name}")
+                    skipped_count += 1
+                    continue
+                
+                # Rename the file
+                if dry_run:
+                    print(f"  → Would rename to: {new_name}")
+                    renamed_count += 1
+                else:
+                    try:
+                        os.rename(file_path, new_path)
+                        print(f"  ✓ Renamed to: {new_name}")
+                        renamed_count += 1
+                    except Exception as e:
+                        print(f"  ✗ Error renaming: {e}")
+                        skipped_count += 1
+    finally:
+        out.write(log_buf.getvalue())
+        out.flush()
     
     print(f"\n{'=' * 60}")
     print(f"Summary:")
@@ -222,9 +278,15 @@ def main():
         help="Show what would be renamed without actually renaming"
     )
     
+    parser.add_argument(
+        "--recursive",
+        action="store_true",
+        help="Also rename audio files in subdirectories"
+    )
+    
     args = parser.parse_args()
     
-    rename_songs(args.directory, dry_run=args.dry_run)
+    rename_songs(args.directory, dry_run=args.dry_run, recursive=args.recursive)
 
 
 if __name__ == "__main__":
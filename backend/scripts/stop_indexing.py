@@ -27,7 +27,8 @@ def stop_indexing():
             SELECT pid, query, state, now() - query_start as duration
             FROM pg_stat_activity
             WHERE query LIKE '%CREATE INDEX%'
-            AND state = 'active';
+            AND state = 'active'
+            AND pid != pg_backend_pid();
         """))
         
         active_queries = result.fetchall()
@@ -40,13 +41,19 @@ def stop_indexing():
         for row in active_queries:
             print(f"  PID {row[0]}: {row[1][:80]}... (running for {row[3]})")
         
-        # Terminate these processes
-        for row in active_queries:
-            pid = row[0]
-            print(f"\nTerminating process {pid}...")
-            session.execute(text(f"SELECT pg_terminate_backend({pid});"))
-            session.commit()
-            print(f"✓ Process {pid} terminated")
+        # Terminate the listed processes in one round-trip
+        pids = [row[0] for row in active_queries]
+        print(f"\nTerminating {len(pids)} processes...")
+        terminated = session.execute(text("""
+            SELECT pid, pg_terminate_backend(pid)
+            FROM unnest(CAST(:pids AS int[])) AS pid;
+        """), {"pids": pids}).fetchall()
+        session.commit()
+        for pid, ok in terminated:
+            if ok:
+                print(f"✓ Process {pid} terminated")
+            else:
+                print(f"✗ Process {pid} was not terminated (already gone?)")
         
         print("\n✓ All index operations stopped")
         print("Note: Partially created indexes have been cancelled.")
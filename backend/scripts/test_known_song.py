@@ -48,13 +48,13 @@ def test_known_song_matching():
     if len(song_fingerprints) < 400:
         print(f"⚠️  Warning: Song only has {len(song_fingerprints)} fingerprints (need 400+ for good matching)")
     
-    # Convert to query format
-    query_fingerprints = [(fp.hash_value, fp.time_offset) for fp in song_fingerprints]
+    # Rows are already (hash_value, time_offset) tuples - find_matches takes them as-is
+    query_fingerprints = song_fingerprints
     
     # Test 1: Full fingerprints (should definitely match)
     print(f"\n3. Test 1: Using all {len(query_fingerprints)} fingerprints")
     print("   " + "-"*56)
-    result = db_manager.find_matches(query_fingerprints)
+    result = db_manager.find_matches(query_fingerprints, session=session)
     
     if result:
         print(f"   ✅ MATCHED: {result['title']} by {result['artist']}")
@@ -75,11 +75,12 @@ def test_known_song_matching():
     if len(query_fingerprints) >= subset_size:
         # Take fingerprints from different parts of the song
         step = len(query_fingerprints) // subset_size
-        subset_fingerprints = query_fingerprints[::step][:subset_size]
+        # One slice (no intermediate every-Nth list that is then cut down)
+        subset_fingerprints = query_fingerprints[:step * subset_size:step]
         
         print(f"\n4. Test 2: Using {len(subset_fingerprints)} sampled fingerprints (simulates recording)")
         print("   " + "-"*56)
-        result = db_manager.find_matches(subset_fingerprints)
+        result = db_manager.find_matches(subset_fingerprints, session=session)
         
         if result:
             print(f"   ✅ MATCHED: {result['title']} by {result['artist']}")
@@ -98,7 +99,7 @@ def test_known_song_matching():
     small_subset = query_fingerprints[:100]
     print(f"\n5. Test 3: Using only {len(small_subset)} fingerprints (stress test)")
     print("   " + "-"*56)
-    result = db_manager.find_matches(small_subset)
+    result = db_manager.find_matches(small_subset, session=session)
     
     if result:
         print(f"   ✅ MATCHED: {result['title']} by {result['artist']}")
@@ -9,6 +9,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.database import DatabaseManager
 from app.fingerprint import AudioFingerprinter
 import librosa
+import numpy as np
 
 def diagnose_recording(recording_path: str):
     """Analyze a recording file and diagnose matching issues"""
@@ -29,9 +30,9 @@ def diagnose_recording(recording_path: str):
     print("\n1. Audio File Analysis:")
     print("   " + "-"*56)
     try:
-        # Get duration and sample rate
-        duration = librosa.get_duration(path=recording_path)
+        # Decode once at the native rate; duration follows from the samples
         y, sr = librosa.load(recording_path, sr=None)
+        duration = len(y) / sr
         
         print(f"   Duration: {duration:.2f} seconds")
         print(f"   Sample Rate: {sr} Hz")
@@ -47,8 +48,9 @@ def diagnose_recording(recording_path: str):
             print(f"   ✅ Duration is good")
         
         # Check audio levels
-        max_amplitude = abs(y).max()
-        rms_level = (y**2).mean()**0.5
+        max_amplitude = float(np.max(np.abs(y)))
+        # dot(y, y) streams y once with no y**2 temporary the size of the recording
+        rms_level = float(np.sqrt(np.dot(y, y) / y.size))
         print(f"   Max amplitude: {max_amplitude:.4f}")
         print(f"   RMS level: {rms_level:.4f}")
         
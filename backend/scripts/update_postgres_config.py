@@ -4,6 +4,7 @@ Run this with administrator privileges.
 """
 
 import os
+import re
 import shutil
 from pathlib import Path
 
@@ -56,21 +57,23 @@ def update_postgresql_conf():
     
     print(f"\n🔧 Updating settings...")
     
+    # One anchored match per line routes it to its setting; longest names first,
+    # and \b keeps e.g. a 'parallel_setup_cost_x' line from matching
+    setting_re = re.compile(
+        r'^\s*(' + '|'.join(map(re.escape, sorted(settings, key=len, reverse=True))) + r')\b'
+    )
+    
     for line in lines:
-        updated = False
-        
-        for setting_name, new_value in settings.items():
-            # Check if this line contains the setting
-            if line.strip().startswith(setting_name):
-                found_settings.add(setting_name)
-                # Replace the line
-                new_line = f"{setting_name} = {new_value}\n"
-                new_lines.append(new_line)
-                print(f"  ✓ Updated: {setting_name} = {new_value}")
-                updated = True
-                break
-        
-        if not updated:
+        match = setting_re.match(line)
+        if match:
+            setting_name = match.group(1)
+            new_value = settings[setting_name]
+            found_settings.add(setting_name)
+            # Replace the line
+            new_line = f"{setting_name} = {new_value}\n"
+            new_lines.append(new_line)
+            print(f"  ✓ Updated: {setting_name} = {new_value}")
+        else:
             new_lines.append(line)
     
     # Add any settings that weren't found
@@ -13,24 +13,116 @@ Install:
 
 import json
 import os
-import urllib.request
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 from pathlib import Path
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+try:
+    import orjson  # C-backed JSON; stdlib json is used when it isn't installed
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 load_dotenv()
 
+# Chart requests in flight at once; each is a small JSON GET, so the fetch is latency-bound
+CHART_WORKERS = 8
+
+# Preview downloads in flight at once
+DOWNLOAD_WORKERS = 20
+
+# API requests in flight at once across all threads, to stay under Deezer's per-IP rate limit
+API_CONCURRENCY = 8
+_API_SEMAPHORE = threading.BoundedSemaphore(API_CONCURRENCY)
+
+# Responses worth retrying: rate limited, or a transient server error
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Seconds to wait on an API request
+REQUEST_TIMEOUT = 10
+
+# Preview downloads: (connect, read) timeouts in seconds, and the copy buffer size
+DOWNLOAD_TIMEOUT = (5, 30)
+DOWNLOAD_CHUNK_SIZE = 1 << 16
+
+# One keep-alive session for every request, so api.deezer.com and the preview
+# CDN hosts are connected to (TCP + TLS) once per pooled connection, not per call.
+# The pool is large enough for all download threads at once.
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=50, pool_maxsize=50))
+
+# Chart responses kept between runs: url -> {'etag': ..., 'data': ...}.
+# Each run sends the stored ETag as If-None-Match and reuses the body on 304.
+CHART_CACHE_FILE = Path('.deezer_chart_cache.json')
+
+# Characters not allowed in filenames (on Windows) -> replacement, applied with str.translate
+_FILENAME_TABLE = str.maketrans({
+    '/': '-',
+    '\\': '-',
+    ':': '-',
+    '*': '-',
+    '?': '-',
+    '"': '-',
+    '<': '-',
+    '>': '-',
+    '|': '-',
+})
+
 # ============================================================================
 # DEEZER API FUNCTIONS (No authentication required!)
 # ============================================================================
 
-def get_deezer_chart(country='', limit=200):
+def get_with_retry(url, max_tries=5, **kwargs):
+    """
+    GET an API url, retrying 429/5xx responses with exponential backoff.
+    Waits for Retry-After instead when the server sends it (in seconds).
+    """
+    for attempt in range(max_tries):
+        with _API_SEMAPHORE:
+            response = _SESSION.get(url, timeout=REQUEST_TIMEOUT, **kwargs)
+        if response.status_code not in RETRY_STATUSES or attempt == max_tries - 1:
+            return response
+        
+        # Back off outside the semaphore so other requests can use the slot
+        retry_after = response.headers.get('Retry-After', '')
+        time.sleep(int(retry_after) if retry_after.isdigit() else 2 ** attempt)
+
+def parse_json(response):
+    """Decode a JSON response body (with orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+def load_chart_cache():
+    """Load the chart response cache (empty if missing or unreadable)."""
+    try:
+        with open(CHART_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_chart_cache(cache):
+    """Write the chart response cache."""
+    try:
+        with open(CHART_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"   Warning: could not save chart cache: {e}")
+
+def get_deezer_chart(country='', limit=200, cache=None):
     """
     Fetch Deezer chart tracks.
     
     Args:
         country: Country code (empty for global, 'in' for India, 'us' for USA, etc.)
         limit: Maximum tracks to fetch
+        cache: Optional dict from load_chart_cache(); a chart the server reports
+               unchanged (HTTP 304) is taken from it, and new ETags are stored in it
     """
     try:
         # Deezer chart endpoint
@@ -39,13 +131,21 @@ def get_deezer_chart(country='', limit=200):
         else:
             url = "https://api.deezer.com/chart/0/tracks"
         
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        cached = cache.get(url) if cache is not None else None
+        headers = {'If-None-Match': cached['etag']} if cached else None
         
-        tracks = []
-        for track in data.get('data', [])[:limit]:
-            tracks.append({
+        response = get_with_retry(url, headers=headers)
+        if cached and response.status_code == 304:
+            data = cached['data']
+        else:
+            response.raise_for_status()
+            data = parse_json(response)
+            etag = response.headers.get('ETag')
+            if cache is not None and etag:
+                cache[url] = {'etag': etag, 'data': data}
+        
+        return [
+            {
                 'title': track['title'],
                 'artist': track['artist']['name'],
                 'album': track.get('album', {}).get('title', ''),
@@ -53,9 +153,9 @@ def get_deezer_chart(country='', limit=200):
                 'preview_url': track.get('preview'),  # 30-second preview
                 'deezer_id': track['id'],
                 'popularity': track.get('rank', 0)
-            })
-        
-        return tracks
+            }
+            for track in islice(data.get('data', ()), limit)
+        ]
     except Exception as e:
         print(f"   Error fetching Deezer chart: {e}")
         return []
@@ -66,30 +166,33 @@ def get_deezer_playlist(playlist_id, limit=200):
         url = f"https://api.deezer.com/playlist/{playlist_id}/tracks"
         params = {'limit': limit}
         
-        response = requests.get(url, params=params)
+        response = get_with_retry(url, params=params)
         response.raise_for_status()
-        data = response.json()
+        data = parse_json(response)
         
-        tracks = []
-        for track in data.get('data', [])[:limit]:
-            tracks.append({
+        return [
+            {
                 'title': track['title'],
                 'artist': track['artist']['name'],
                 'album': track.get('album', {}).get('title', ''),
                 'duration': track['duration'],
                 'preview_url': track.get('preview'),
                 'deezer_id': track['id'],
-            })
-        
-        return tracks
+            }
+            for track in islice(data.get('data', ()), limit)
+        ]
     except Exception as e:
         print(f"   Error fetching Deezer playlist: {e}")
         return []
 
-def get_deezer_songs():
+def get_deezer_songs(on_chart=None):
     """
     Fetch popular songs from Deezer charts.
     No API credentials needed!
+    
+    Args:
+        on_chart: Optional callback(name, tracks), called for each chart as soon
+                  as its tracks are in (e.g. to start downloading its previews)
     """
     print("\n🎵 Using Deezer API (No authentication required)")
     print("=" * 60)
@@ -116,21 +219,36 @@ def get_deezer_songs():
     all_songs = {}
     total_songs = 0
     
-    for name, (country, limit) in sources.items():
-        print(f"\nFetching {name}...")
-        try:
-            tracks = get_deezer_chart(country, limit)
-            
-            # Add region info
-            region = name.split(' ')[0]
-            for track in tracks:
-                track['region'] = region
+    cache = load_chart_cache()
+    
+    # Start every chart request up front; results are still reported in source order
+    with ThreadPoolExecutor(max_workers=CHART_WORKERS) as executor:
+        futures = {
+            name: executor.submit(get_deezer_chart, country, limit, cache)
+            for name, (country, limit) in sources.items()
+        }
+        
+        for name, future in futures.items():
+            print(f"\nFetching {name}...")
+            try:
+                tracks = future.result()
+                
+                # Add region info
+                region = name.split(' ')[0]
+                for track in tracks:
+                    track['region'] = region
+                
+                all_songs[name] = tracks
+                total_songs += len(tracks)
+                print(f"   ✓ Fetched {len(tracks)} tracks")
+            except Exception as e:
+                print(f"   ✗ Error: {e}")
+                continue
             
-            all_songs[name] = tracks
-            total_songs += len(tracks)
-            print(f"   ✓ Fetched {len(tracks)} tracks")
-        except Exception as e:
-            print(f"   ✗ Error: {e}")
+            if on_chart is not None:
+                on_chart(name, tracks)
+    
+    save_chart_cache(cache)
     
     return all_songs, total_songs
 
@@ -160,71 +278,77 @@ def get_spotify_client():
 
 def download_preview(preview_url, output_path):
     """Download a Spotify preview URL (30-second clip)."""
+    # Written under a .part name and renamed into place only once complete, so a
+    # failed download never leaves a truncated file that later runs would skip
+    output_path = Path(output_path)
+    part_path = output_path.with_suffix('.part')
     try:
-        urllib.request.urlretrieve(preview_url, output_path)
+        # Streamed straight to disk in 64 KB copies instead of held in memory
+        with _SESSION.get(preview_url, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            with open(part_path, 'wb') as f:
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+        os.replace(part_path, output_path)
         return True
     except Exception as e:
+        part_path.unlink(missing_ok=True)
         print(f"   ✗ Download failed: {e}")
         return False
 
-def download_previews_from_json(json_file='music_songs_list.json', output_dir='music_previews'):
-    """
-    Download preview clips for all songs in the JSON file.
-    Creates output_dir and downloads all available previews.
+def preview_jobs(tracks, output_path, existing):
     """
-    # Load JSON
-    if not os.path.exists(json_file):
-        # Try old filename
-        json_file = 'spotify_songs_list.json'
-        if not os.path.exists(json_file):
-            print(f"❌ {json_file} not found. Run get_popular_songs() first.")
-            return
-    
-    with open(json_file, 'r', encoding='utf-8') as f:
-        all_songs = json.load(f)
+    Work out which of tracks' previews still need downloading.
     
-    # Create output directory
-    output_path = Path(output_dir)
-    output_path.mkdir(exist_ok=True)
+    existing is the set of filenames already in output_path; queued names are
+    added to it, so a song in several charts is downloaded once.
+    Returns ([(filename, preview_url, file_path), ...], tracks without a preview).
+    """
+    jobs = []
+    no_preview = 0
     
-    print(f"\n📥 Downloading preview clips to {output_dir}/")
-    print("=" * 60)
+    for track in tracks:
+        preview_url = track.get('preview_url')
+        if not preview_url:
+            no_preview += 1
+            continue
+        
+        # Clean filename
+        title = track['title'].translate(_FILENAME_TABLE)
+        artist = track['artist'].translate(_FILENAME_TABLE)
+        filename = f"{artist} - {title}.mp3"
+        
+        # Limit filename length
+        if len(filename) > 200:
+            filename = filename[:200] + '.mp3'
+        
+        # Skip if already exists
+        if filename in existing:
+            print(f"   ⏭️  {filename[:60]}... (already exists)")
+            continue
+        
+        existing.add(filename)
+        jobs.append((filename, preview_url, output_path / filename))
     
+    return jobs, no_preview
+
+def collect_downloads(futures):
+    """
+    Report download futures ({future: filename}) as each one finishes.
+    Counted on the calling thread, so one slow preview doesn't hold back the
+    progress of the others. Returns (downloaded, failed).
+    """
     downloaded = 0
-    skipped = 0
     failed = 0
-    
-    for playlist_name, tracks in all_songs.items():
-        print(f"\n{playlist_name}:")
-        
-        for track in tracks:
-            preview_url = track.get('preview_url')
-            if not preview_url:
-                skipped += 1
-                continue
-            
-            # Clean filename
-            title = track['title'].replace('/', '-').replace('\\', '-').replace(':', '-')
-            artist = track['artist'].replace('/', '-').replace('\\', '-').replace(':', '-')
-            filename = f"{artist} - {title}.mp3"
-            
-            # Limit filename length
-            if len(filename) > 200:
-                filename = filename[:200] + '.mp3'
-            
-            file_path = output_path / filename
-            
-            # Skip if already exists
-            if file_path.exists():
-                print(f"   ⏭️  {filename[:60]}... (already exists)")
-                continue
-            
-            print(f"   📥 {filename[:60]}...")
-            if download_preview(preview_url, file_path):
-                downloaded += 1
-            else:
-                failed += 1
-    
+    for future in as_completed(futures):
+        print(f"   📥 {futures[future][:60]}...")
+        if future.result():
+            downloaded += 1
+        else:
+            failed += 1
+    return downloaded, failed
+
+def print_download_summary(output_path, downloaded, skipped, failed):
     print("\n" + "=" * 60)
     print(f"✅ Download complete!")
     print(f"   Downloaded: {downloaded}")
@@ -233,17 +357,25 @@ def download_previews_from_json(json_file='music_songs_list.json', output_dir='m
     print(f"\n📁 Audio files saved to: {output_path.absolute()}")
     print(f"\n⚠️  Note: These are 30-second preview clips only.")
     print(f"   For full songs, you'll need to source audio from legal services.")
+
+def download_previews_from_json(json_file='music_songs_list.json', output_dir='music_previews'):
     """
     Download preview clips for all songs in the JSON file.
     Creates output_dir and downloads all available previews.
     """
     # Load JSON
     if not os.path.exists(json_file):
-        print(f"❌ {json_file} not found. Run get_popular_songs() first.")
-        return
+        # Try old filename
+        json_file = 'spotify_songs_list.json'
+        if not os.path.exists(json_file):
+            print(f"❌ {json_file} not found. Run get_popular_songs() first.")
+            return
     
-    with open(json_file, 'r', encoding='utf-8') as f:
-        all_songs = json.load(f)
+    if ORJSON_AVAILABLE:
+        all_songs = orjson.loads(Path(json_file).read_bytes())
+    else:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            all_songs = json.load(f)
     
     # Create output directory
     output_path = Path(output_dir)
@@ -252,68 +384,80 @@ def download_previews_from_json(json_file='music_songs_list.json', output_dir='m
     print(f"\n📥 Downloading preview clips to {output_dir}/")
     print("=" * 60)
     
-    downloaded = 0
+    # One directory listing instead of a stat per track
+    existing = set(os.listdir(output_path))
+    pending = []
     skipped = 0
-    failed = 0
     
     for playlist_name, tracks in all_songs.items():
         print(f"\n{playlist_name}:")
+        jobs, no_preview = preview_jobs(tracks, output_path, existing)
+        pending.extend(jobs)
+        skipped += no_preview
+    
+    # Download on a thread pool; each preview is a small, latency-bound GET
+    print(f"\nDownloading {len(pending)} previews ({DOWNLOAD_WORKERS} at a time)...")
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        futures = {
+            executor.submit(download_preview, preview_url, file_path): filename
+            for filename, preview_url, file_path in pending
+        }
+        downloaded, failed = collect_downloads(futures)
+    
+    print_download_summary(output_path, downloaded, skipped, failed)
+
+def fetch_and_download(output_dir='music_previews'):
+    """
+    Fetch the charts and download their previews in one pipelined run.
+    
+    Each chart's previews are queued for download as soon as its tracks are in,
+    so downloads overlap the remaining chart fetches instead of waiting for the
+    song list to be written first.
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(exist_ok=True)
+    
+    existing = set(os.listdir(output_path))
+    futures = {}
+    skipped = 0
+    
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+        def queue_chart(name, tracks):
+            nonlocal skipped
+            jobs, no_preview = preview_jobs(tracks, output_path, existing)
+            skipped += no_preview
+            for filename, preview_url, file_path in jobs:
+                futures[executor.submit(download_preview, preview_url, file_path)] = filename
         
-        for track in tracks:
-            preview_url = track.get('preview_url')
-            if not preview_url:
-                skipped += 1
-                continue
-            
-            # Clean filename
-            title = track['title'].replace('/', '-').replace('\\', '-')
-            artist = track['artist'].replace('/', '-').replace('\\', '-')
-            filename = f"{artist} - {title}.mp3"
-            
-            # Limit filename length
-            if len(filename) > 200:
-                filename = filename[:200] + '.mp3'
-            
-            file_path = output_path / filename
-            
-            # Skip if already exists
-            if file_path.exists():
-                print(f"   ⏭️  {filename[:60]}... (already exists)")
-                continue
-            
-            print(f"   📥 {filename[:60]}...")
-            if download_preview(preview_url, file_path):
-                downloaded += 1
-            else:
-                failed += 1
+        songs = get_popular_songs(use_deezer=True, on_chart=queue_chart)
+        if not songs:
+            return
+        
+        print(f"\n📥 Downloading preview clips to {output_dir}/")
+        print("=" * 60)
+        downloaded, failed = collect_downloads(futures)
     
-    print("\n" + "=" * 60)
-    print(f"✅ Download complete!")
-    print(f"   Downloaded: {downloaded}")
-    print(f"   Skipped (no preview): {skipped}")
-    print(f"   Failed: {failed}")
-    print(f"\n📁 Audio files saved to: {output_path.absolute()}")
-    print(f"\n⚠️  Note: These are 30-second preview clips only.")
-    print(f"   For full songs, you'll need to source audio from legal services.")
+    print_download_summary(output_path, downloaded, skipped, failed)
 
 
-def get_popular_songs(use_deezer=True):
+def get_popular_songs(use_deezer=True, on_chart=None):
     """
     Get popular songs from music charts.
     
     Args:
         use_deezer: If True, use Deezer API. If False, try Spotify.
+        on_chart: Optional callback(name, tracks) passed to get_deezer_songs
     """
     
     if use_deezer:
         # Use Deezer API (no credentials needed)
-        all_songs, total_songs = get_deezer_songs()
+        all_songs, total_songs = get_deezer_songs(on_chart)
     else:
         # Try Spotify API
         sp = get_spotify_client()
         if not sp:
             print("\n❌ Spotify API not configured. Falling back to Deezer...")
-            all_songs, total_songs = get_deezer_songs()
+            all_songs, total_songs = get_deezer_songs(on_chart)
         else:
             print("\n🎵 Using Spotify API")
             # ... existing Spotify code would go here ...
@@ -324,31 +468,37 @@ def get_popular_songs(use_deezer=True):
     
     # Save to JSON
     output_json = 'music_songs_list.json'
-    with open(output_json, 'w', encoding='utf-8') as f:
-        json.dump(all_songs, f, indent=2, ensure_ascii=False)
+    if ORJSON_AVAILABLE:
+        Path(output_json).write_bytes(orjson.dumps(all_songs, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_json, 'w', encoding='utf-8') as f:
+            json.dump(all_songs, f, indent=2, ensure_ascii=False)
     
-    # Flatten and save to CSV
+    # Flatten and save to CSV in one pass, collecting the stats on the way;
+    # each row gets its playlist column without changing the track dicts
     import csv
-    all_tracks = []
-    for playlist_name, tracks in all_songs.items():
-        for track in tracks:
-            track['playlist'] = playlist_name
-            all_tracks.append(track)
+    first_track = next((track for tracks in all_songs.values() for track in tracks), None)
     
-    if all_tracks:
+    if first_track is not None:
         output_csv = 'music_songs_list.csv'
+        with_preview = 0
+        song_ids = set()
         with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=all_tracks[0].keys())
+            writer = csv.DictWriter(f, fieldnames=[*first_track.keys(), 'playlist'])
             writer.writeheader()
-            writer.writerows(all_tracks)
+            for playlist_name, tracks in all_songs.items():
+                for track in tracks:
+                    writer.writerow({**track, 'playlist': playlist_name})
+                    if track.get('preview_url'):
+                        with_preview += 1
+                    song_ids.add(track.get('deezer_id') or track.get('spotify_id'))
         
         print(f"\n✅ Saved {total_songs} songs to:")
         print(f"   - {output_json}")
         print(f"   - {output_csv}")
         
         # Stats
-        with_preview = sum(1 for s in all_tracks if s.get('preview_url'))
-        unique_songs = len(set(s.get('deezer_id') or s.get('spotify_id') for s in all_tracks))
+        unique_songs = len(song_ids)
         
         print(f"\n📊 Stats:")
         print(f"   Total songs: {total_songs}")
@@ -361,7 +511,16 @@ def get_popular_songs(use_deezer=True):
     return all_songs
 
 if __name__ == "__main__":
-    import sys
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Fetch music charts and download preview clips")
+    parser.add_argument(
+        "command",
+        choices=["fetch", "download", "all"],
+        help="fetch: fetch song lists; download: download preview clips from the saved list; "
+             "all: fetch and download at the same time"
+    )
+    args = parser.parse_args()
     
     print("\n" + "=" * 60)
     print("MUSIC CHART FETCHER")
@@ -371,51 +530,21 @@ if __name__ == "__main__":
     print("   - 30-second preview clips available")
     print("   - Charts from 15+ countries")
     
-    if len(sys.argv) > 1:
-        command = sys.argv[1]
-        
-        if command == 'fetch':
-            # Fetch song metadata
-            songs = get_popular_songs(use_deezer=True)
-            
-            if songs:
-                print("\n📝 Sample songs:")
-                for playlist_name, tracks in list(songs.items())[:3]:
-                    print(f"\n{playlist_name}:")
-                    for song in tracks[:3]:
-                        print(f"   • {song['title']} - {song['artist']}")
-        
-        elif command == 'download':
-            # Download preview clips
-            download_previews_from_json()
+    if args.command == 'fetch':
+        # Fetch song metadata
+        songs = get_popular_songs(use_deezer=True)
         
-        else:
-            print(f"❌ Unknown command: {command}")
-            print("\nUsage:")
-            print("  python get_spotify_recommendations.py fetch     - Fetch song lists")
-            print("  python get_spotify_recommendations.py download  - Download preview clips")
+        if songs:
+            print("\n📝 Sample songs:")
+            for playlist_name, tracks in list(songs.items())[:3]:
+                print(f"\n{playlist_name}:")
+                for song in tracks[:3]:
+                    print(f"   • {song['title']} - {song['artist']}")
+    
+    elif args.command == 'download':
+        # Download preview clips
+        download_previews_from_json()
+    
     else:
-        # Interactive mode
-        print("\nWhat would you like to do?")
-        print("1. Fetch song metadata from Deezer charts")
-        print("2. Download preview clips (30-second)")
-        print("3. Both (fetch then download)")
-        
-        choice = input("\nEnter choice (1/2/3): ").strip()
-        
-        if choice == '1':
-            songs = get_popular_songs(use_deezer=True)
-            if songs:
-                print("\n✅ Done! Check music_songs_list.json and .csv")
-        
-        elif choice == '2':
-            download_previews_from_json()
-        
-        elif choice == '3':
-            songs = get_popular_songs(use_deezer=True)
-            if songs:
-                print("\n" + "=" * 60)
-                download_previews_from_json()
-        
-        else:
-            print("❌ Invalid choice")
\ No newline at end of file
+        # Fetch song metadata, downloading previews as each chart comes in
+        fetch_and_download()
@@ -3,15 +3,29 @@
 Quick test to verify:
 1. Song upload is now FAST (no preprocessing)
 2. Song identification still works (preprocessing applied)
+
+With --all, every file in sample-songs/ is uploaded and identified
+concurrently and the latency percentiles and throughput are reported.
 """
 
+import argparse
 import requests
+import statistics
+import threading
 import time
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 BASE_URL = "http://localhost:8000/api/v1"
 
+parser = argparse.ArgumentParser(description="Test song upload and identification")
+parser.add_argument("--all", action="store_true",
+                    help="Upload and identify every sample file concurrently")
+parser.add_argument("--workers", type=int, default=8,
+                    help="Concurrent upload+identify pairs with --all (default: 8)")
+args = parser.parse_args()
+
 # Find a test audio file
 sample_songs_dir = Path("./sample-songs")
 audio_files = list(sample_songs_dir.glob("*.mp3")) + list(sample_songs_dir.glob("*.wav"))
@@ -20,16 +34,107 @@ if not audio_files:
     print("ERROR: No audio files found in sample-songs/")
     exit(1)
 
+
+def extract_meta(path):
+    """(title, artist) from an "Artist - Title" filename."""
+    if " - " in path.stem:
+        artist, title = path.stem.split(" - ", 1)
+        return title, artist
+    return path.stem, "Unknown"
+
+
+# One keep-alive session per worker thread
+_local = threading.local()
+
+
+def _session():
+    if not hasattr(_local, "session"):
+        _local.session = requests.Session()
+    return _local.session
+
+
+def upload_and_identify(path):
+    """
+    Upload then identify one file; returns (path, upload_s, identify_s, matched, error).
+    Connection errors and timeouts are returned as error, like non-200 responses.
+    """
+    session = _session()
+    title, artist = extract_meta(path)
+    
+    start = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            response = session.post(f"{BASE_URL}/songs/upload", files={'file': f},
+                                    data={'title': title, 'artist': artist})
+    except requests.RequestException as e:
+        return path, time.perf_counter() - start, None, False, f"upload failed: {e}"
+    upload_s = time.perf_counter() - start
+    if response.status_code != 200:
+        return path, upload_s, None, False, f"upload {response.status_code}: {response.text[:100]}"
+    
+    start = time.perf_counter()
+    try:
+        with open(path, 'rb') as f:
+            response = session.post(f"{BASE_URL}/identify", files={'file': f})
+    except requests.RequestException as e:
+        return path, upload_s, time.perf_counter() - start, False, f"identify failed: {e}"
+    identify_s = time.perf_counter() - start
+    if response.status_code != 200:
+        return path, upload_s, identify_s, False, f"identify {response.status_code}: {response.text[:100]}"
+    
+    result = response.json()
+    matched = result['matched'] and result['song']['title'] == title
+    return path, upload_s, identify_s, matched, None
+
+
+def percentiles(values):
+    """(p50, p95) of a list of timings."""
+    if len(values) < 2:
+        return values[0], values[0]
+    cuts = statistics.quantiles(values, n=20)
+    return cuts[9], cuts[18]
+
+
+if args.all:
+    print(f"Uploading and identifying {len(audio_files)} files with {args.workers} workers...\n")
+    
+    upload_times = []
+    identify_times = []
+    matched_count = 0
+    errors = 0
+    
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(upload_and_identify, path) for path in audio_files]
+        for future in as_completed(futures):
+            path, upload_s, identify_s, matched, error = future.result()
+            upload_times.append(upload_s)
+            if error:
+                errors += 1
+                print(f"✗ {path.name}: {error}")
+                continue
+            identify_times.append(identify_s)
+            matched_count += matched
+            print(f"{'✓' if matched else '✗'} {path.name} (upload {upload_s:.2f}s, identify {identify_s:.2f}s)")
+    wall_time = time.perf_counter() - start_time
+    
+    print("\n" + "=" * 60)
+    print("SUMMARY")
+    print("=" * 60)
+    print(f"Files: {len(audio_files)} | Matched: {matched_count} | Errors: {errors}")
+    print(f"Wall time: {wall_time:.2f}s ({len(audio_files) / wall_time:.2f} files/s)")
+    p50, p95 = percentiles(upload_times)
+    print(f"Upload time:   p50 {p50:.2f}s, p95 {p95:.2f}s")
+    if identify_times:
+        p50, p95 = percentiles(identify_times)
+        print(f"Identify time: p50 {p50:.2f}s, p95 {p95:.2f}s")
+    exit(0 if errors == 0 else 1)
+
 test_file = audio_files[0]
 print(f"Test file: {test_file}")
 
 # Extract title and artist from filename
-filename = test_file.stem
-if " - " in filename:
-    artist, title = filename.split(" - ", 1)
-else:
-    title = filename
-    artist = "Unknown"
+title, artist = extract_meta(test_file)
 
 print(f"Title: {title}")
 print(f"Artist: {artist}\n")